@@ -1,9 +1,21 @@
+import hashlib
 import requests
 import pandas as pd
 import matplotlib.pyplot as plt
 import json
 import numpy as np
+import threading
+import os
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from api_cache import ResponseCache
+from data_export import get_exporter
+from instrumentation import METRICS, observe, stage, timed
+from snapshot_store import SnapshotStore
 import warnings
 warnings.filterwarnings('ignore')
 try:
@@ -23,18 +35,112 @@ try:
 except ImportError:
     HAS_PLOTLY = False
     print("⚠️ Plotly not found. Using matplotlib for all visualizations.")
+CRYPTO_COLUMNS = [
+    'id', 'symbol', 'name', 'current_price', 'market_cap', 'market_cap_rank',
+    'total_volume', 'high_24h', 'low_24h', 'price_change_24h',
+    'price_change_percentage_24h', 'circulating_supply', 'last_updated'
+]
+TRENDS_HOURS = 24
+WEATHER_SCHEMA = {
+    'name': 'object',
+    'temperature': 'float64',
+    'humidity': 'float64',
+    'pressure': 'float64',
+    'condition': 'object'
+}
+def normalize_weather(records):
+    """Flatten raw weather records into the WEATHER_SCHEMA columns in one columnar pass"""
+    raw = pd.DataFrame.from_records(records, columns=['name', 'main', 'weather'])
+    main = pd.DataFrame(raw['main'].tolist(), columns=['temp', 'humidity', 'pressure'], index=raw.index)
+    weather_df = pd.DataFrame({
+        'name': raw['name'],
+        'temperature': main['temp'],
+        'humidity': main['humidity'],
+        'pressure': main['pressure'],
+        'condition': raw['weather'].str[0].str.get('main')
+    })
+    return weather_df.astype(WEATHER_SCHEMA)
+def fingerprint(data):
+    """Content hash of a fetched payload (parsed JSON or DataFrame), stable across runs"""
+    if isinstance(data, pd.DataFrame):
+        digest = hashlib.sha256(','.join(map(str, data.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(data, index=False).values.tobytes())
+        return digest.hexdigest()
+    return hashlib.sha256(json.dumps(data, sort_keys=True, separators=(',', ':'), default=str).encode()).hexdigest()
+class RateLimiter:
+    """Thread-safe limiter that spaces calls to stay within a requests-per-minute budget"""
+    def __init__(self, requests_per_minute):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self.next_allowed = 0.0
+        self.lock = threading.Lock()
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_allowed - now
+            self.next_allowed = max(now, self.next_allowed) + self.interval
+        if delay > 0:
+            time.sleep(delay)
 class APIDataVisualizer:
-    def __init__(self):
+    def __init__(self, apis=None, timeouts=None, max_workers=4, retries=3, backoff_factor=0.5,
+                 use_cache=True, cache_dir='.api_cache', cache_ttls=None,
+                 crypto_all_pages=False, crypto_per_page=250, crypto_max_pages=None, crypto_requests_per_minute=30,
+                 headless=False, output_dir='dashboards', export_formats=('png', 'html'), snapshot_db=None,
+                 refresh_state='.dashboard_refresh.json'):
         self.data = {}
-        self.apis = {
+        self.frames = {}
+        self.fingerprints = {}
+        self.panel_results = {}
+        self.refresh_state = refresh_state
+        self.headless = headless
+        self.output_dir = output_dir
+        self.export_formats = tuple(export_formats)
+        self.render_times = {}
+        self.figure_started = None
+        self.exported_files = []
+        self.weather_df = None
+        self.weather_source = None
+        self.snapshots = SnapshotStore(snapshot_db) if snapshot_db else None
+        if headless:
+            plt.switch_backend('Agg')
+        self.apis = apis if apis is not None else {
             'users': 'https://jsonplaceholder.typicode.com/users',
             'posts': 'https://jsonplaceholder.typicode.com/posts',
             'todos': 'https://jsonplaceholder.typicode.com/todos',
             'crypto': 'https://api.coingecko.com/api/v3/coins/markets?vs_currency=usd&order=market_cap_desc&per_page=20&page=1',
             'weather': 'https://api.openweathermap.org/data/2.5/group?id=524901,703448,2643743,2988507,3117735&units=metric&appid=demo'
         }
+        self.crypto_markets_url = 'https://api.coingecko.com/api/v3/coins/markets?vs_currency=usd&order=market_cap_desc'
+        self.crypto_all_pages = crypto_all_pages
+        self.crypto_per_page = crypto_per_page
+        self.crypto_max_pages = crypto_max_pages
+        self.crypto_requests_per_minute = crypto_requests_per_minute
+        self.timeouts = {'users': 10, 'posts': 10, 'todos': 10, 'crypto': 15, 'weather': 10}
+        if timeouts:
+            self.timeouts.update(timeouts)
+        self.cache_ttls = {'users': 86400, 'posts': 86400, 'todos': 86400, 'crypto': 60, 'weather': 600}
+        if cache_ttls:
+            self.cache_ttls.update(cache_ttls)
+        self.cache = ResponseCache(cache_dir) if use_cache else None
+        self.max_workers = max_workers
+        self.fetch_times = {}
+        self.session = self.create_session(max_workers, retries, backoff_factor)
+    def create_session(self, pool_size, retries, backoff_factor):
+        """Create a keep-alive session with a bounded connection pool and retry/backoff"""
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET']),
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
     def fetch_data(self, api_name):
         """Fetch data from the specified API"""
+        start = time.perf_counter()
         try:
             print(f"📡 Fetching data from {api_name} API...")
             
@@ -49,15 +155,100 @@ class APIDataVisualizer:
                 ]
                 self.data[api_name] = mock_weather
                 print(f"✅ Successfully fetched {len(mock_weather)} weather records")
-                return
-            response = requests.get(self.apis[api_name], timeout=10)
-            response.raise_for_status()   
-            data = response.json()
+                self.record_snapshot(api_name)
+                return mock_weather
+            if api_name == 'crypto' and self.crypto_all_pages:
+                crypto_df = self.fetch_crypto_markets()
+                self.frames[api_name] = crypto_df
+                print(f"✅ Successfully fetched {len(crypto_df)} records from {api_name} ({self.crypto_per_page}/page)")
+                self.record_snapshot(api_name)
+                return crypto_df
+            timeout = self.timeouts.get(api_name, 10)
+            if self.cache is not None:
+                data = self.cache.get(self.session, self.apis[api_name], self.cache_ttls.get(api_name, 0), timeout)
+            else:
+                response = self.session.get(self.apis[api_name], timeout=timeout)
+                response.raise_for_status()   
+                data = response.json()
             self.data[api_name] = data
             print(f"✅ Successfully fetched {len(data)} records from {api_name}")
+            self.record_snapshot(api_name)
+            return data
         except requests.RequestException as e:
             print(f"❌ Error fetching data from {api_name}: {e}")
             return None
+        finally:
+            self.fetch_times[api_name] = time.perf_counter() - start
+            observe(f'fetch.{api_name}', self.fetch_times[api_name])
+    def record_snapshot(self, api_name):
+        """Append the latest crypto or weather fetch to the snapshot store"""
+        if self.snapshots is None or api_name not in ('crypto', 'weather'):
+            return
+        try:
+            if api_name == 'crypto':
+                crypto_df = self.frames.get('crypto')
+                if crypto_df is None:
+                    crypto_df = pd.DataFrame(self.data['crypto'])
+                rows = self.snapshots.record_crypto(crypto_df)
+            else:
+                rows = self.snapshots.record_weather(self.get_weather_frame())
+            if rows:
+                print(f"🕒 Recorded {rows} {api_name} rows in snapshot store")
+        except Exception as e:
+            print(f"❌ Error recording {api_name} snapshot: {e}")
+    def fetch_all(self, api_names=None):
+        """Fetch several APIs concurrently over the shared session; returns this call's payloads, None where a fetch failed"""
+        api_names = list(api_names) if api_names is not None else list(self.apis)
+        start = time.perf_counter()
+        results = {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(api_names)) or 1) as executor:
+            futures = {executor.submit(self.fetch_data, name): name for name in api_names}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        elapsed = time.perf_counter() - start
+        sequential = sum(self.fetch_times.get(name, 0) for name in api_names)
+        print(f"⚡ Fetched {len(api_names)} APIs in {elapsed:.2f}s (sequential would take ~{sequential:.2f}s)")
+        return {name: results.get(name) for name in api_names}
+    def fetch_crypto_page(self, page, per_page, limiter):
+        """Fetch a single page of the crypto markets endpoint"""
+        url = f"{self.crypto_markets_url}&per_page={per_page}&page={page}"
+        timeout = self.timeouts.get('crypto', 15)
+        if self.cache is not None:
+            ttl = self.cache_ttls.get('crypto', 0)
+            if not self.cache.is_fresh(url, ttl):
+                limiter.wait()
+            return self.cache.get(self.session, url, ttl, timeout)
+        limiter.wait()
+        response = self.session.get(url, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+    def iter_crypto_pages(self, per_page=None, max_pages=None, max_workers=None, requests_per_minute=None):
+        """Yield crypto market pages in order as DataFrames, fetching a window of pages concurrently"""
+        per_page = per_page or self.crypto_per_page
+        max_pages = max_pages if max_pages is not None else self.crypto_max_pages
+        max_workers = max_workers or self.max_workers
+        limiter = RateLimiter(requests_per_minute or self.crypto_requests_per_minute)
+        page = 1
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while max_pages is None or page <= max_pages:
+                last = page + max_workers if max_pages is None else min(page + max_workers, max_pages + 1)
+                futures = [executor.submit(self.fetch_crypto_page, p, per_page, limiter) for p in range(page, last)]
+                for future in futures:
+                    records = future.result()
+                    if records:
+                        yield pd.DataFrame.from_records(records, columns=CRYPTO_COLUMNS)
+                    if len(records) < per_page:
+                        for pending in futures:
+                            pending.cancel()
+                        return
+                page = last
+    def fetch_crypto_markets(self, **kwargs):
+        """Stream every crypto market page into one columnar frame"""
+        pages = list(self.iter_crypto_pages(**kwargs))
+        if not pages:
+            return pd.DataFrame(columns=CRYPTO_COLUMNS)
+        return pd.concat(pages, ignore_index=True)
+    @timed('analyze.users')
     def analyze_users_data(self):
         """Analyze and visualize users data"""
         if 'users' not in self.data:
@@ -68,6 +259,7 @@ class APIDataVisualizer:
         print(f"Total Users: {len(users_df)}")
         print(f"Unique Companies: {users_df['company.name'].nunique()}")
         print(f"Unique Cities: {users_df['address.city'].nunique()}")
+        self.start_figure()
         fig, axes = plt.subplots(2, 2, figsize=(15, 12))
         fig.suptitle('👥 Users Data Analysis Dashboard', fontsize=16, fontweight='bold')
         company_counts = users_df['company.name'].value_counts()
@@ -90,9 +282,12 @@ class APIDataVisualizer:
         axes[1,1].set_title('Email Domains')
         axes[1,1].tick_params(axis='x', rotation=45)
         plt.tight_layout()
-        plt.show()
+        self.show_figure(fig, 'users_dashboard')
         if HAS_PLOTLY:
-            fig_plotly = px.scatter_mapbox(
+            self.start_figure()
+            use_maplibre = hasattr(px, 'scatter_map')
+            scatter_map = px.scatter_map if use_maplibre else px.scatter_mapbox
+            fig_plotly = scatter_map(
                 users_df, 
                 lat='address.geo.lat', 
                 lon='address.geo.lng',
@@ -102,11 +297,15 @@ class APIDataVisualizer:
                 height=600,
                 title="🗺️ Interactive User Geographic Distribution"
             )
-            fig_plotly.update_layout(mapbox_style="open-street-map")
-            fig_plotly.show()
+            if use_maplibre:
+                fig_plotly.update_layout(map_style="open-street-map")
+            else:
+                fig_plotly.update_layout(mapbox_style="open-street-map")
+            self.show_plotly(fig_plotly, 'users_map')
         else:
             print("📍 Install plotly for interactive map: pip install plotly")
         return users_df
+    @timed('analyze.posts')
     def analyze_posts_data(self):
         """Analyze and visualize posts data"""
         if 'posts' not in self.data:
@@ -118,6 +317,7 @@ class APIDataVisualizer:
         print(f"Unique Authors: {posts_df['userId'].nunique()}")
         posts_df['title_length'] = posts_df['title'].str.len()
         posts_df['body_length'] = posts_df['body'].str.len()
+        self.start_figure()
         fig, axes = plt.subplots(2, 2, figsize=(15, 12))
         fig.suptitle('📝 Posts Data Analysis Dashboard', fontsize=16, fontweight='bold')
         posts_per_user = posts_df['userId'].value_counts().sort_index()
@@ -142,22 +342,29 @@ class APIDataVisualizer:
                       transform=axes[1,1].transAxes, bbox=dict(boxstyle="round", facecolor='wheat'))
         
         plt.tight_layout()
-        plt.show()
+        self.show_figure(fig, 'posts_dashboard')
         return posts_df
+    @timed('analyze.crypto')
     def analyze_crypto_data(self):
         """Analyze and visualize cryptocurrency data"""
-        if 'crypto' not in self.data:
+        if 'crypto' not in self.data and 'crypto' not in self.frames:
             self.fetch_data('crypto')
-        if not self.data.get('crypto'):
+        crypto_df = self.frames.get('crypto')
+        if crypto_df is None:
+            if not self.data.get('crypto'):
+                print("❌ No crypto data available")
+                return
+            crypto_df = pd.DataFrame(self.data['crypto'])
+        if crypto_df.empty:
             print("❌ No crypto data available")
             return
-        crypto_df = pd.DataFrame(self.data['crypto'])
         print("\n₿ CRYPTOCURRENCY DATA ANALYSIS")
         print("=" * 50)
         print(f"Total Cryptocurrencies: {len(crypto_df)}")
         print(f"Total Market Cap: ${crypto_df['market_cap'].sum():,.0f}")
         print(f"Average 24h Change: {crypto_df['price_change_percentage_24h'].mean():.2f}%")
         if HAS_PLOTLY:
+            self.start_figure()
             fig = make_subplots(
                 rows=2, cols=2,
                 subplot_titles=['Market Cap Distribution', 'Price vs Market Cap', 
@@ -190,10 +397,11 @@ class APIDataVisualizer:
                 row=2, col=2
             )
             fig.update_layout(height=800, title_text="₿ Cryptocurrency Market Analysis Dashboard")
-            fig.show()
+            self.show_plotly(fig, 'crypto_interactive')
         else:
             print("📊 Using matplotlib for crypto visualization...")
         
+        self.start_figure()
         plt.figure(figsize=(15, 10))
         plt.subplot(2, 2, 1)
         top_10 = crypto_df.head(10)
@@ -221,22 +429,27 @@ class APIDataVisualizer:
         plt.ylabel('Trading Volume')
         plt.title('Market Cap vs Trading Volume')
         plt.tight_layout()
-        plt.show()
+        self.show_figure(plt.gcf(), 'crypto_dashboard')
         return crypto_df
+    def get_weather_frame(self):
+        """Return the normalized weather frame, recomputing it only when the raw data changes"""
+        records = self.data['weather']
+        if self.weather_source is not records:
+            self.weather_df = normalize_weather(records)
+            self.weather_source = records
+        return self.weather_df
+    @timed('analyze.weather')
     def analyze_weather_data(self):
         """Analyze and visualize weather data"""
         if 'weather' not in self.data:
             self.fetch_data('weather')
-        weather_df = pd.DataFrame(self.data['weather'])
-        weather_df['temperature'] = [w['temp'] for w in weather_df['main']]
-        weather_df['humidity'] = [w['humidity'] for w in weather_df['main']]
-        weather_df['pressure'] = [w['pressure'] for w in weather_df['main']]
-        weather_df['condition'] = [w[0]['main'] for w in weather_df['weather']]
+        weather_df = self.get_weather_frame()
         print("\n🌤️ WEATHER DATA ANALYSIS")
         print("=" * 50)
         print(f"Cities: {len(weather_df)}")
         print(f"Average Temperature: {weather_df['temperature'].mean():.1f}°C")
         print(f"Average Humidity: {weather_df['humidity'].mean():.1f}%")
+        self.start_figure()
         fig, axes = plt.subplots(2, 2, figsize=(15, 12))
         fig.suptitle('🌤️ Weather Data Analysis Dashboard', fontsize=16, fontweight='bold')
         axes[0,0].bar(weather_df['name'], weather_df['temperature'], color='orange', alpha=0.7)
@@ -258,12 +471,115 @@ class APIDataVisualizer:
         for i, city in enumerate(weather_df['name']):
             axes[1,1].annotate(city, (weather_df['temperature'].iloc[i], weather_df['humidity'].iloc[i]))       
         plt.tight_layout()
-        plt.show()
+        self.show_figure(fig, 'weather_dashboard')
         return weather_df
-    def comprehensive_analysis(self):
+    def analyze_trends(self, hours=TRENDS_HOURS, top_n=5):
+        """Plot price and temperature trend lines from the snapshot store"""
+        if self.snapshots is None:
+            print("❌ No snapshot store configured (pass snapshot_db or --snapshot-db)")
+            return
+        start = time.time() - hours * 3600
+        crypto_aggs = self.snapshots.aggregates('crypto')
+        weather_history = self.snapshots.query('weather', start=start)
+        print("\n📈 TREND ANALYSIS")
+        print("=" * 50)
+        print(f"Tracked Coins: {len(crypto_aggs)}")
+        print(f"Weather Snapshots (last {hours}h): {len(weather_history)}")
+        self.start_figure()
+        fig, axes = plt.subplots(1, 2, figsize=(15, 6))
+        fig.suptitle('📈 Price & Temperature Trends', fontsize=16, fontweight='bold')
+        top_coins = crypto_aggs.sort_values('last_price', ascending=False).head(top_n)
+        for coin_id in top_coins['coin_id']:
+            history = self.snapshots.query('crypto', start=start, key=coin_id)
+            axes[0].plot(pd.to_datetime(history['ts'], unit='s'), history['price'], marker='o', label=coin_id)
+        axes[0].set_ylabel('Price (USD)')
+        axes[0].set_title(f'Top {top_n} Coin Prices')
+        axes[0].legend()
+        for city, history in weather_history.groupby('city'):
+            axes[1].plot(pd.to_datetime(history['ts'], unit='s'), history['temperature'], marker='o', label=city)
+        axes[1].set_ylabel('Temperature (°C)')
+        axes[1].set_title('Temperature by City')
+        axes[1].legend()
+        fig.autofmt_xdate()
+        plt.tight_layout()
+        self.show_figure(fig, 'trends_dashboard')
+        return crypto_aggs
+    def show_figure(self, fig, name):
+        """Show a matplotlib figure, or export it to png/svg/pdf files in headless mode"""
+        if not self.headless:
+            plt.show()
+            plt.close(fig)
+            return
+        start = time.perf_counter()
+        os.makedirs(self.output_dir, exist_ok=True)
+        for fmt in self.export_formats:
+            if fmt in ('png', 'svg', 'pdf'):
+                path = os.path.join(self.output_dir, f'{name}.{fmt}')
+                fig.savefig(path, dpi=100)
+                self.exported_files.append(path)
+        plt.close(fig)
+        self.finish_figure(name, start)
+    def show_plotly(self, fig, name):
+        """Show a plotly figure, or export it to a standalone HTML file in headless mode"""
+        if not self.headless:
+            fig.show()
+            return
+        if 'html' not in self.export_formats:
+            return
+        start = time.perf_counter()
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(self.output_dir, f'{name}.html')
+        fig.write_html(path, include_plotlyjs='cdn')
+        self.exported_files.append(path)
+        self.finish_figure(name, start)
+    def start_figure(self):
+        self.figure_started = time.perf_counter()
+    def finish_figure(self, name, save_started):
+        """Record a figure's render time from its construction (start_figure) to its saved files"""
+        now = time.perf_counter()
+        started = self.figure_started if self.figure_started is not None else save_started
+        self.figure_started = None
+        self.render_times[name] = now - started
+        observe(f'render.{name}', self.render_times[name])
+        observe(f'render.{name}.save', now - save_started)
+    def render_dashboards(self, dashboards=None, max_workers=None):
+        """Fetch once, then build every dashboard headlessly in parallel worker processes"""
+        dashboards = list(dashboards) if dashboards is not None else list(DASHBOARDS)
+        self.fetch_all(dashboards)
+        start = time.perf_counter()
+        results = {}
+        with ProcessPoolExecutor(max_workers=max_workers or len(dashboards)) as executor:
+            futures = {
+                executor.submit(render_dashboard, name, self.data, self.frames, self.output_dir, self.export_formats): name
+                for name in dashboards
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    print(f"❌ Error rendering {name} dashboard: {e}")
+                    continue
+                self.render_times.update(results[name]['render_times'])
+                observe(f'dashboard.{name}', results[name]['elapsed'])
+                for figure, seconds in results[name]['render_times'].items():
+                    observe(f'render.{figure}', seconds)
+                self.exported_files.extend(results[name]['files'])
+        elapsed = time.perf_counter() - start
+        print("\n🖼️ HEADLESS RENDER REPORT")
+        print("=" * 50)
+        for name, result in sorted(results.items()):
+            print(f"{name:<10} {result['elapsed']:6.2f}s  ({len(result['files'])} files)")
+            for figure, seconds in result['render_times'].items():
+                print(f"    {figure:<20} build+export {seconds:6.2f}s")
+        print(f"Total wall time: {elapsed:.2f}s")
+        print(METRICS.report())
+        return results
+    def comprehensive_analysis(self, export_format='csv', export_dir='.', incremental=False):
         """Run comprehensive analysis on all APIs"""
         print("🚀 STARTING COMPREHENSIVE API DATA ANALYSIS")
         print("=" * 60)
+        self.fetch_all(['users', 'posts', 'crypto', 'weather'])
         users_df = self.analyze_users_data()
         posts_df = self.analyze_posts_data()
         crypto_df = self.analyze_crypto_data()
@@ -278,28 +594,186 @@ class APIDataVisualizer:
             print(f"₿ Crypto: {len(crypto_df)} records")
         if weather_df is not None:
             print(f"🌤️ Weather: {len(weather_df)} records")
-        self.save_data_to_files()
+        if self.cache is not None:
+            stats = self.cache.stats
+            print(f"🗄️ Cache: {stats['hits']} hits, {stats['misses']} misses, {stats['revalidated']} revalidated")
+        self.save_data_to_files(export_format, export_dir, incremental)
+        print("\n⏱️ STAGE TIMINGS")
+        print("=" * 50)
+        print(METRICS.report())
         print("\n✅ Analysis completed successfully!")
-        print("📁 Data saved to CSV files for further analysis")
-    def save_data_to_files(self):
-        """Save fetched data to CSV files"""
-        for api_name, data in self.data.items():
+        print(f"📁 Data saved to {export_format.upper()} files for further analysis")
+    def panel_key(self, panel):
+        parts = [self.fingerprints[name] for name in REFRESH_DEPENDENCIES[panel]]
+        if panel == 'trends':
+            # the trend window slides with the clock, so key on what the store returns for it right now
+            start = time.time() - TRENDS_HOURS * 3600
+            parts += [repr(self.snapshots.window_summary(kind, start)) for kind in ('crypto', 'weather')]
+        return hashlib.sha256('|'.join(parts).encode()).hexdigest()
+    def load_refresh_state(self):
+        try:
+            with open(self.refresh_state, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        state.setdefault('panels', {})
+        state.setdefault('exports', {})
+        return state
+    def save_refresh_state(self, state):
+        tmp_path = f"{self.refresh_state}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.refresh_state)
+    def refresh(self, api_names=None, export_format='csv', export_dir='.', incremental=False):
+        """Re-fetch, then rerun only the panels and exports whose input fingerprints changed since the last refresh.
+
+        Panel and export fingerprints are kept in the refresh_state file so unchanged work is also
+        skipped across runs; a panel whose exported figure files have gone missing is rebuilt. A panel
+        whose inputs failed to fetch this time, or that raised while rendering, is reported as failed.
+        """
+        api_names = list(api_names) if api_names is not None else list(DASHBOARDS)
+        state = self.load_refresh_state()
+        for api_name, data in self.fetch_all(api_names).items():
+            if data is None:
+                self.fingerprints.pop(api_name, None)
+            else:
+                self.fingerprints[api_name] = fingerprint(data)
+        panels = list(api_names)
+        if self.snapshots is not None and 'crypto' in api_names:
+            panels.append('trends')
+        summary = {}
+        for panel in panels:
+            inputs = REFRESH_DEPENDENCIES[panel]
+            if any(name not in self.fingerprints for name in inputs):
+                summary[panel] = 'failed'
+                continue
+            key = self.panel_key(panel)
+            previous = state['panels'].get(panel)
+            if previous and previous['fingerprint'] == key and all(os.path.exists(path) for path in previous['files']):
+                summary[panel] = 'unchanged'
+                continue
+            first_file = len(self.exported_files)
             try:
-                if api_name == 'weather':
-                    df = pd.DataFrame(data)
-                    df['temperature'] = [w['temp'] for w in df['main']]
-                    df['humidity'] = [w['humidity'] for w in df['main']]
-                    df['condition'] = [w[0]['main'] for w in df['weather']]
-                    df[['name', 'temperature', 'humidity', 'condition']].to_csv(f'{api_name}_data.csv', index=False)
-                else:
-                    df = pd.json_normalize(data) if isinstance(data, list) else pd.DataFrame([data])
-                    df.to_csv(f'{api_name}_data.csv', index=False)
-                print(f"💾 Saved {api_name} data to {api_name}_data.csv")
+                with stage(f'refresh.{panel}'):
+                    self.panel_results[panel] = getattr(self, REFRESH_PANELS[panel])()
             except Exception as e:
-                print(f"❌ Error saving {api_name} data: {e}")
-def main():
+                print(f"❌ Error refreshing {panel} panel: {e}")
+                plt.close('all')
+                state['panels'].pop(panel, None)
+                summary[panel] = 'failed'
+                continue
+            state['panels'][panel] = {'fingerprint': key, 'files': self.exported_files[first_file:]}
+            summary[panel] = 'refreshed'
+        exporter = get_exporter(export_format, export_dir)
+        for api_name in api_names:
+            digest = self.fingerprints.get(api_name)
+            previous = state['exports'].get(api_name)
+            if digest is None or (previous and previous['fingerprint'] == digest
+                                  and previous['format'] == export_format and os.path.exists(previous['path'])):
+                continue
+            path = self.export_dataset(exporter, api_name, incremental)
+            if path is not None:
+                state['exports'][api_name] = {'fingerprint': digest, 'format': export_format, 'path': path}
+        self.save_refresh_state(state)
+        print("\n🔁 REFRESH SUMMARY")
+        print("=" * 50)
+        for panel, status in summary.items():
+            print(f"{panel:<10} {status}")
+        return summary
+    def save_data_to_files(self, export_format='csv', output_dir='.', incremental=False, compression=None):
+        """Save fetched data as CSV, Parquet or Feather snapshots"""
+        exporter = get_exporter(export_format, output_dir, **({'compression': compression} if compression else {}))
+        for api_name in dict.fromkeys(list(self.data) + list(self.frames)):
+            self.export_dataset(exporter, api_name, incremental)
+    def export_dataset(self, exporter, api_name, incremental=False):
+        try:
+            with stage(f'export.{api_name}'):
+                df = self.export_frame(api_name)
+                path, rows = exporter.export(api_name, df, key=EXPORT_KEYS.get(api_name, 'id'), incremental=incremental)
+        except Exception as e:
+            print(f"❌ Error saving {api_name} data: {e}")
+            return None
+        if incremental:
+            print(f"💾 Saved {api_name} data to {path} ({rows} new or changed rows)")
+        else:
+            print(f"💾 Saved {api_name} data to {path}")
+        return path
+    def export_frame(self, api_name):
+        """Build the typed frame that gets exported for a dataset"""
+        if api_name in self.frames and api_name not in self.data:
+            return self.frames[api_name]
+        data = self.data[api_name]
+        if api_name == 'weather':
+            return self.get_weather_frame()[['name', 'temperature', 'humidity', 'condition']]
+        df = pd.json_normalize(data) if isinstance(data, list) else pd.DataFrame([data])
+        for column in ('address.geo.lat', 'address.geo.lng'):
+            if column in df.columns:
+                df[column] = df[column].astype(float)
+        return df
+EXPORT_KEYS = {'weather': 'name'}
+DASHBOARDS = {
+    'users': 'analyze_users_data',
+    'posts': 'analyze_posts_data',
+    'crypto': 'analyze_crypto_data',
+    'weather': 'analyze_weather_data'
+}
+REFRESH_PANELS = dict(DASHBOARDS, trends='analyze_trends')
+REFRESH_DEPENDENCIES = {
+    'users': ('users',),
+    'posts': ('posts',),
+    'crypto': ('crypto',),
+    'weather': ('weather',),
+    'trends': ('crypto', 'weather')
+}
+def render_dashboard(name, data, frames, output_dir, export_formats):
+    """Worker entry point: build one dashboard headlessly from already-fetched data"""
+    start = time.perf_counter()
+    visualizer = APIDataVisualizer(use_cache=False, headless=True, output_dir=output_dir, export_formats=export_formats)
+    visualizer.data = data
+    visualizer.frames = frames
+    getattr(visualizer, DASHBOARDS[name])()
+    return {
+        'elapsed': time.perf_counter() - start,
+        'render_times': visualizer.render_times,
+        'files': visualizer.exported_files
+    }
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="API integration & data visualization dashboards")
+    parser.add_argument('--headless', action='store_true', help="render dashboards to files instead of opening windows")
+    parser.add_argument('--output-dir', default='dashboards', help="directory for headless exports")
+    parser.add_argument('--formats', default='png,html', help="comma-separated export formats (png, svg, pdf, html)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes for headless rendering")
+    parser.add_argument('--all-crypto-pages', action='store_true', help="ingest the full crypto market list")
+    parser.add_argument('--export-format', default='csv', choices=['csv', 'parquet', 'feather'], help="format for saved datasets")
+    parser.add_argument('--export-dir', default='.', help="directory for saved datasets")
+    parser.add_argument('--incremental', action='store_true', help="only write new or changed rows, keyed on id")
+    parser.add_argument('--snapshot-db', default=None, help="SQLite file recording crypto/weather snapshots over time")
+    parser.add_argument('--refresh', action='store_true',
+                        help="only rebuild panels and exports whose input data changed (implies --headless)")
+    parser.add_argument('--refresh-interval', type=float, default=None, help="with --refresh, repeat every N seconds")
+    parser.add_argument('--refresh-state', default='.dashboard_refresh.json', help="file holding refresh fingerprints")
+    return parser.parse_args(argv)
+def main(argv=None):
     """Main function to run the API data visualization"""
-    visualizer = APIDataVisualizer()
+    args = parse_args(argv)
+    visualizer = APIDataVisualizer(
+        crypto_all_pages=args.all_crypto_pages,
+        # refresh tracks panels by their exported files, so it always renders headlessly
+        headless=args.headless or args.refresh,
+        output_dir=args.output_dir,
+        export_formats=[fmt.strip() for fmt in args.formats.split(',') if fmt.strip()],
+        snapshot_db=args.snapshot_db,
+        refresh_state=args.refresh_state
+    )
+    if args.refresh:
+        while True:
+            visualizer.refresh(export_format=args.export_format, export_dir=args.export_dir, incremental=args.incremental)
+            if not args.refresh_interval:
+                return
+            time.sleep(args.refresh_interval)
+    if args.headless:
+        visualizer.render_dashboards(max_workers=args.workers)
+        return
     
     print("🎯API INTEGRATION & DATA VISUALIZATION")
     print("=" * 70)
@@ -310,7 +784,8 @@ def main():
     print("✅ Interactive visualizations with Plotly")
     print("✅ Data export functionality")
     print("=" * 70)
-    visualizer.comprehensive_analysis()
+    export_options = {'export_format': args.export_format, 'export_dir': args.export_dir, 'incremental': args.incremental}
+    visualizer.comprehensive_analysis(**export_options)
     while True:
         print("\n🎛️ INTERACTIVE MENU")
         print("1. Analyze Users Data")
@@ -331,7 +806,7 @@ def main():
         elif choice == '4':
             visualizer.analyze_weather_data()
         elif choice == '5':
-            visualizer.comprehensive_analysis()
+            visualizer.comprehensive_analysis(**export_options)
         elif choice == '6':
             print("👋 Thank you for using the API Data Visualizer!")
             break
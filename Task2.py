@@ -1,30 +1,159 @@
-
+import argparse
+import hashlib
+import os
+import pickle
+import time
 import pandas as pd
-from fpdf import FPDF
-from fpdf.enums import XPos, YPos
-df = pd.read_excel("data.xlsx")
-df.columns = df.columns.str.strip()
-total_employees = len(df)
-total_salary = df["Salary"].sum()
-pdf = FPDF()
-pdf.add_page()
-pdf.set_font("Helvetica", "B", 16)
-pdf.cell(200, 10, text="Employee Salary Report", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
-pdf.set_font("Helvetica", size=12)
-pdf.ln(5)
-pdf.cell(200, 10, text=f"Total Employees: {total_employees}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-pdf.cell(200, 10, text=f"Total Salary: Rs {total_salary}", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
-pdf.ln(5)
-pdf.set_font("Helvetica", "B", 12)
-pdf.cell(60, 10, "Name", border=1)
-pdf.cell(60, 10, "Department", border=1)
-pdf.cell(60, 10, "Salary", border=1)
-pdf.ln()
-pdf.set_font("Helvetica", "", 12)
-for index, row in df.iterrows():
-    pdf.cell(60, 10, str(row["Name"]), border=1)
-    pdf.cell(60, 10, str(row["Department"]), border=1)
-    pdf.cell(60, 10, f"Rs {row['Salary']}", border=1)
-    pdf.ln()
-pdf.output("report.pdf")
-print("PDF report generated successfully")
+from instrumentation import METRICS, count, stage
+from report_engine import ReportPDF, TableRenderer
+COLUMNS = ["Name", "Department", "Salary"]
+SUMMARY_COLUMNS = ["Department", "Headcount", "Subtotal", "Average", "Median"]
+MONEY = {"Subtotal": "Rs {:,.0f}", "Average": "Rs {:,.2f}", "Median": "Rs {:,.2f}"}
+CACHE_VERSION = 2
+CACHE_KEYS = {"mtime_ns", "size", "sha256", "rows", "summary"}
+def employee_table():
+    return TableRenderer(COLUMNS, formats={"Salary": "Rs {}"}, size=12, align='L')
+def totals_block(pdf, total_employees, total_salary):
+    pdf.text_line(f"Total Employees: {total_employees}")
+    pdf.text_line(f"Total Salary: Rs {total_salary}")
+def load_salary_frame(input_file):
+    df = pd.read_excel(input_file)
+    df.columns = df.columns.str.strip()
+    return df[COLUMNS]
+def aggregate_salaries(df):
+    """Per-department headcount, subtotal, average and median in one groupby pass; rows come back sorted by department.
+
+    headcount counts every row (blank salaries included) and blank departments form their own
+    group, sorted last like the rows, so the headcounts slice rows into department sections.
+    """
+    df = df.sort_values("Department", kind="stable").reset_index(drop=True)
+    summary = df.groupby("Department", sort=True, dropna=False)["Salary"].agg(
+        headcount="size", subtotal="sum", average="mean", median="median"
+    )
+    return df, summary
+def file_digest(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+def read_cache(cache_file):
+    """The cached entry, or None when it is missing, truncated or not a cache entry at all"""
+    try:
+        cached = pd.read_pickle(cache_file)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, IndexError, TypeError, ValueError):
+        return None
+    return cached if isinstance(cached, dict) and CACHE_KEYS <= cached.keys() else None
+def write_cache(cached, cache_file):
+    tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+    pd.to_pickle(cached, tmp_file)
+    os.replace(tmp_file, cache_file)
+def load_aggregates(input_file, cache_dir=".report_cache"):
+    """Return (rows, summary), reusing a pickled copy while the workbook is unchanged.
+
+    mtime and size are checked first; if either moved, the content hash decides, so
+    a touched-but-identical workbook still hits the cache.
+    """
+    if not cache_dir:
+        return aggregate_salaries(load_salary_frame(input_file))
+    stat = os.stat(input_file)
+    name = hashlib.sha256(os.path.abspath(input_file).encode()).hexdigest()[:16]
+    cache_file = os.path.join(cache_dir, f"{name}-v{CACHE_VERSION}.pkl")
+    cached = read_cache(cache_file)
+    digest = None
+    if cached is not None:
+        if (cached["mtime_ns"], cached["size"]) == (stat.st_mtime_ns, stat.st_size):
+            return cached["rows"], cached["summary"]
+        digest = file_digest(input_file)
+        if digest == cached["sha256"]:
+            cached.update(mtime_ns=stat.st_mtime_ns, size=stat.st_size)
+            write_cache(cached, cache_file)
+            return cached["rows"], cached["summary"]
+    rows, summary = aggregate_salaries(load_salary_frame(input_file))
+    os.makedirs(cache_dir, exist_ok=True)
+    write_cache({
+        "mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": digest or file_digest(input_file),
+        "rows": rows, "summary": summary
+    }, cache_file)
+    return rows, summary
+def generate_report(input_file="data.xlsx", output_file="report.pdf", cache_dir=".report_cache"):
+    """Summary page followed by one section per department, each closed by its subtotal rows"""
+    with stage('salary.load'):
+        rows, summary = load_aggregates(input_file, cache_dir)
+    total_employees = len(rows)
+    total_salary = summary["subtotal"].sum()
+    pdf = ReportPDF()
+    with stage('salary.render'):
+        pdf.title_block("Employee Salary Report")
+        totals_block(pdf, total_employees, total_salary)
+        pdf.ln(5)
+        TableRenderer(SUMMARY_COLUMNS, formats=MONEY, size=12, align='L').render(pdf, summary.reset_index())
+        employees = employee_table()
+        employees.fit_sample(pdf, rows)
+        stats_table = TableRenderer(["Statistic", "Value"], widths=[120, pdf.epw - 120], size=12, align='L',
+                                    bold=True, show_header=False)
+        start = 0
+        for stats in summary.itertuples():
+            pdf.add_page()
+            pdf.text_line(str(stats.Index), bold=True, size=14)
+            employees.render(pdf, rows.iloc[start:start + stats.headcount])
+            start += stats.headcount
+            stats_table.render(pdf, [("Headcount", stats.headcount)] + [
+                (label, MONEY[label].format(value))
+                for label, value in (("Subtotal", stats.subtotal), ("Average", stats.average), ("Median", stats.median))
+            ])
+    with stage('salary.output'):
+        pdf.write_to(output_file)
+    count('salary.rows', total_employees)
+    return total_employees, total_salary
+def iter_employee_rows(input_file):
+    """Yield (name, department, salary) from the first sheet without loading the workbook into memory"""
+    from openpyxl import load_workbook
+    workbook = load_workbook(input_file, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(cell).strip() if cell is not None else '' for cell in next(rows)]
+        positions = [header.index(column) for column in COLUMNS]
+        for row in rows:
+            if row is None or all(cell is None for cell in row):
+                continue
+            yield tuple(row[position] for position in positions)
+    finally:
+        workbook.close()
+def generate_report_streaming(input_file="data.xlsx", output_file="report.pdf"):
+    """Stream rows from a read-only workbook, keeping running totals; totals are printed after the table"""
+    totals = [0, 0]
+    def counted(rows):
+        for row in rows:
+            totals[0] += 1
+            totals[1] += row[2] or 0
+            yield row
+    pdf = ReportPDF()
+    with stage('salary.stream_render'):
+        pdf.title_block("Employee Salary Report")
+        employee_table().render(pdf, counted(iter_employee_rows(input_file)))
+        pdf.ln(5)
+        totals_block(pdf, *totals)
+    with stage('salary.output'):
+        pdf.write_to(output_file)
+    count('salary.rows', totals[0])
+    return totals[0], totals[1]
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the employee salary PDF report")
+    parser.add_argument('--input', default="data.xlsx")
+    parser.add_argument('--output', default="report.pdf")
+    parser.add_argument('--stream', action='store_true', help="stream rows from a read-only workbook for very large inputs")
+    parser.add_argument('--cache-dir', default=".report_cache", help="where parsed rows and department aggregates are cached")
+    parser.add_argument('--no-cache', action='store_true')
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    if args.stream:
+        total_employees, _ = generate_report_streaming(args.input, args.output)
+    else:
+        total_employees, _ = generate_report(args.input, args.output, None if args.no_cache else args.cache_dir)
+    elapsed = time.perf_counter() - start
+    print("PDF report generated successfully")
+    print(f"{total_employees} rows in {elapsed:.2f}s ({total_employees / elapsed if elapsed else 0:,.0f} rows/s)")
+    print(METRICS.report())
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,26 @@
-import nltk
+import hashlib
+import json
+import os
+import re
+import zipfile
 import numpy as np
-import string
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-def ensurenltkdata():
-    try:
-        nltk.data.find('tokenizers/punkt')
-    except LookupError:
-        nltk.download('punkt', quiet=True)
-    try:
-        nltk.data.find('corpora/wordnet')
-    except LookupError:
-        nltk.download('wordnet', quiet=True)
-    try:
-        nltk.data.find('corpora/omw-1.4')
-    except LookupError:
-        nltk.download('omw-1.4', quiet=True)
-ensurenltkdata()
+from chatbot_retrieval import makeretriever
+from instrumentation import stage
+from text_preprocessing import CHATBOT_NORMALIZER
+nltkresources = {
+    'punkt': 'tokenizers/punkt',
+    'wordnet': 'corpora/wordnet',
+    'omw-1.4': 'corpora/omw-1.4'
+}
+def ensurenltkdata(resources=('punkt', 'wordnet', 'omw-1.4')):
+    if not resources:
+        return
+    import nltk
+    for resource in resources:
+        try:
+            nltk.data.find(nltkresources[resource])
+        except LookupError:
+            nltk.download(resource, quiet=True)
 chatbotresponses = [
     "Hello, how can I assist you?",
     "I'm doing well, thanks for asking.",
@@ -36,22 +40,123 @@ chatbotresponses = [
     "You're welcome!"
 ]
 def normalizetext(inputtext):
-    return inputtext.lower().translate(str.maketrans('', '', string.punctuation))
-normalizedresponses = [normalizetext(response) for response in chatbotresponses]
+    return CHATBOT_NORMALIZER.normalize(inputtext)
+fallbackresponse = "Sorry, I didn't understand that. Could you rephrase it?"
+modelpath = os.environ.get('CHATBOT_MODEL', 'chatbot_model.npz')
+tokenpattern = re.compile(r"(?u)\b\w\w+\b")
+retrievalbackend = os.environ.get('CHATBOT_BACKEND', 'exact')
+artifactversion = 2
+def corpushash(responses):
+    return hashlib.sha256('\n'.join(responses).encode('utf-8')).hexdigest()
+def artifactkey(responses):
+    """Everything the stored vocabulary depends on: corpus, normalization, tokenization and artifact layout"""
+    settings = {'version': artifactversion, 'corpus': corpushash(responses),
+                'normalizer': CHATBOT_NORMALIZER.config(), 'tokenpattern': tokenpattern.pattern}
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode('utf-8')).hexdigest()
+class ChatbotEngine:
+    nltkresources = ()
+    def __init__(self, responses=None, threshold=0.3, backend=None, backendoptions=None):
+        self.responses = list(responses if responses is not None else chatbotresponses)
+        self.threshold = threshold
+        self.backend = backend or retrievalbackend
+        self.backendoptions = backendoptions or {}
+        self.vocabulary = None
+        self.idf = None
+        self.responsematrix = None
+        self.retriever = None
+        self.storedkey = None
+    def fit(self):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        ensurenltkdata(self.nltkresources)
+        vectorizer = TfidfVectorizer(token_pattern=tokenpattern.pattern)
+        self.responsematrix = vectorizer.fit_transform([normalizetext(response) for response in self.responses]).tocsr()
+        self.vocabulary = {term: int(idx) for term, idx in vectorizer.vocabulary_.items()}
+        self.idf = vectorizer.idf_
+        self.retriever = makeretriever(self.backend, self.responsematrix, **self.backendoptions)
+        return self
+    def transform(self, userinputs):
+        from scipy.sparse import csr_matrix
+        indptr, indices, data = [0], [], []
+        for userinput in userinputs:
+            counts = {}
+            for token in tokenpattern.findall(normalizetext(userinput)):
+                termidx = self.vocabulary.get(token)
+                if termidx is not None:
+                    counts[termidx] = counts.get(termidx, 0) + 1
+            termidxs = sorted(counts)
+            weights = np.array([counts[termidx] for termidx in termidxs], dtype=np.float64) * self.idf[termidxs]
+            norm = np.sqrt(np.dot(weights, weights))
+            indices.extend(termidxs)
+            data.extend(weights / norm if norm else weights)
+            indptr.append(len(indices))
+        return csr_matrix((np.array(data, dtype=np.float64), np.array(indices, dtype=np.int32), indptr), shape=(len(userinputs), len(self.idf)))
+    def search(self, userinputs):
+        return self.retriever.search(self.transform(userinputs))
+    def pickresponse(self, responseidx, score):
+        if score < self.threshold:
+            return fallbackresponse
+        if responseidx % 2 == 0 and responseidx + 1 < len(self.responses):
+            return self.responses[responseidx + 1]
+        return self.responses[responseidx]
+    def respond(self, userinput):
+        return self.respondbatch([userinput])[0]
+    def respondbatch(self, userinputs):
+        bestidx, bestscores = self.search(userinputs)
+        return [self.pickresponse(int(idx), score) for idx, score in zip(bestidx, bestscores)]
+    def save(self, path=modelpath):
+        terms = sorted(self.vocabulary, key=self.vocabulary.get)
+        tmppath = f"{path}.{os.getpid()}.tmp"
+        with open(tmppath, 'wb') as f:
+            np.savez(
+                f,
+                responses=np.array(self.responses),
+                artifactkey=np.array(artifactkey(self.responses)),
+                threshold=np.array(self.threshold),
+                terms=np.array(terms),
+                idf=self.idf,
+                data=self.responsematrix.data,
+                indices=self.responsematrix.indices,
+                indptr=self.responsematrix.indptr,
+                shape=np.array(self.responsematrix.shape)
+            )
+        os.replace(tmppath, path)
+    @classmethod
+    def load(cls, path=modelpath, backend=None, backendoptions=None):
+        from scipy.sparse import csr_matrix
+        with np.load(path, allow_pickle=False) as artifact:
+            engine = cls(artifact['responses'].tolist(), float(artifact['threshold']), backend, backendoptions)
+            engine.storedkey = str(artifact['artifactkey'])
+            engine.vocabulary = {term: idx for idx, term in enumerate(artifact['terms'].tolist())}
+            engine.idf = artifact['idf']
+            engine.responsematrix = csr_matrix(
+                (artifact['data'], artifact['indices'], artifact['indptr']), shape=tuple(artifact['shape'])
+            )
+        engine.retriever = makeretriever(engine.backend, engine.responsematrix, **engine.backendoptions)
+        return engine
+    @classmethod
+    def loadorfit(cls, path=modelpath, responses=None, backend=None, backendoptions=None):
+        responses = list(responses if responses is not None else chatbotresponses)
+        if os.path.exists(path):
+            try:
+                engine = cls.load(path, backend, backendoptions)
+            except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+                engine = None
+            if engine is not None and engine.storedkey == artifactkey(responses):
+                return engine
+        engine = cls(responses, backend=backend, backendoptions=backendoptions).fit()
+        engine.save(path)
+        return engine
+defaultengine = None
+def getdefaultengine():
+    global defaultengine
+    if defaultengine is None:
+        with stage('chatbot.loadorfit'):
+            defaultengine = ChatbotEngine.loadorfit()
+    return defaultengine
 def getchatbotresponse(userinput):
-    normalizedinput = normalizetext(userinput)
-    normalizedresponses.append(normalizedinput)
-    vectorizer = TfidfVectorizer()
-    tfidfmatrix = vectorizer.fit_transform(normalizedresponses)
-    similaritiescores = cosine_similarity(tfidfmatrix[-1], tfidfmatrix[:-1])
-    responseidx = np.argmax(similaritiescores)
-    normalizedresponses.pop()
-    if similaritiescores[0][responseidx] < 0.3:
-        return "Sorry, I didn't understand that. Could you rephrase it?"
-    if responseidx % 2 == 0 and responseidx + 1 < len(chatbotresponses):
-        return chatbotresponses[responseidx + 1]
-    else:
-        return chatbotresponses[responseidx]
+    engine = getdefaultengine()
+    with stage('chatbot.respond'):
+        return engine.respond(userinput)
 def runchatbot():
     print("Chatbot: Hello! I'm an NLP-powered chatbot. Type 'quit' to exit.")
     while True:
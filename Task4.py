@@ -1,25 +1,118 @@
+import argparse
+import hashlib
+import json
+import mailbox
+import os
+import sys
+import time
+from itertools import islice
+import joblib
+import sklearn
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.naive_bayes import MultinomialNB
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.svm import SVC
-from sklearn.metrics import accuracy_score, classification_report, confusion_matrix
-from sklearn.pipeline import Pipeline
+from joblib import Parallel, delayed
+from instrumentation import count, observe, stage
+from text_preprocessing import SPAM_NORMALIZER
 import warnings
 warnings.filterwarnings('ignore')
 
-plt.style.use('seaborn-v0_8')
-sns.set_palette("husl")
+# plotting and training-only sklearn modules are imported where they are used, so that
+# `predict` against saved artifacts only loads what unpickling the models needs
+
+ARTIFACT_VERSION = 3
+
+VECTORIZER_GRID = {
+    'max_features': [1000, 5000],
+    'ngram_range': [(1, 1), (1, 2)]
+}
+
+def default_classifier_grids():
+    from sklearn.naive_bayes import MultinomialNB
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.svm import SVC
+    return {
+        'Naive Bayes': (MultinomialNB, {'alpha': [0.1, 0.5, 1.0]}),
+        'Random Forest': (RandomForestClassifier, {'n_estimators': [50, 100], 'max_depth': [None, 20], 'random_state': [42]}),
+        'SVM': (SVC, {'kernel': ['linear'], 'C': [0.1, 1.0, 10.0], 'random_state': [42]})
+    }
+
+def clean_emails(emails, normalizer=SPAM_NORMALIZER):
+    return normalizer.normalize_series(emails)
+
+def dataset_hash(df):
+    hashes = pd.util.hash_pandas_object(df[['email', 'label']], index=False)
+    return hashlib.sha256(hashes.values.tobytes()).hexdigest()
+
+def read_artifact_metadata(model_dir):
+    try:
+        with open(os.path.join(model_dir, 'metadata.json'), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def artifacts_match(model_dir, data_hash):
+    metadata = read_artifact_metadata(model_dir)
+    return (
+        metadata is not None
+        and metadata.get('version') == ARTIFACT_VERSION
+        and metadata.get('sklearn_version') == sklearn.__version__
+        and metadata.get('data_hash') == data_hash
+    )
+
+def compute_metrics(y_true, y_pred):
+    from sklearn.metrics import accuracy_score, confusion_matrix, precision_recall_fscore_support
+    precision, recall, f1, _ = precision_recall_fscore_support(y_true, y_pred, average='binary', pos_label=1, zero_division=0)
+    return {
+        'accuracy': accuracy_score(y_true, y_pred),
+        'precision': precision,
+        'recall': recall,
+        'f1': f1,
+        'confusion_matrix': confusion_matrix(y_true, y_pred, labels=[0, 1])
+    }
+
+def vectorize_fold(vec_key, vec_params, fold, train_idx, test_idx, emails):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    vectorizer = TfidfVectorizer(stop_words='english', **vec_params)
+    X_train = vectorizer.fit_transform(emails[train_idx])
+    return (vec_key, fold), (X_train, vectorizer.transform(emails[test_idx]))
+
+def score_config(name, model_class, params, X_train, y_train, X_test, y_test):
+    model = model_class(**params)
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_time = time.perf_counter() - start
+    start = time.perf_counter()
+    y_pred = model.predict(X_test)
+    predict_time = time.perf_counter() - start
+    return compute_metrics(y_test, y_pred), fit_time, predict_time
+
+def fit_classifier(name, model, X, y):
+    start = time.perf_counter()
+    model.fit(X, y)
+    return name, model, time.perf_counter() - start
 
 class EmailSpamDetector:
-    def __init__(self):
+    def __init__(self, use_hashing=False, n_jobs=-1, normalizer=SPAM_NORMALIZER):
         self.models = {}
-        self.vectorizer = TfidfVectorizer(max_features=5000, stop_words='english')
+        self.normalizer = normalizer
+        self.use_hashing = use_hashing
+        self.n_jobs = n_jobs
+        self.vectorizer = self.make_vectorizer()
         self.results = {}
+        self.timings = {}
+        self.best_model_name = None
+        self.best_model = None
+        self.leaderboard = None
+    
+    def make_vectorizer(self):
+        from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer, TfidfVectorizer
+        from sklearn.pipeline import make_pipeline
+        if self.use_hashing:
+            return make_pipeline(
+                HashingVectorizer(n_features=2**18, alternate_sign=False, stop_words='english'),
+                TfidfTransformer()
+            )
+        return TfidfVectorizer(max_features=5000, stop_words='english')
         
     def create_sample_dataset(self):
         emails = [
@@ -53,41 +146,81 @@ class EmailSpamDetector:
         return pd.DataFrame({'email': emails, 'label': labels})
     
     def preprocess_data(self, df):
-        df['email'] = df['email'].str.lower()
-        df['email'] = df['email'].str.replace(r'[^a-zA-Z\s]', '', regex=True)
+        df['email'] = clean_emails(df['email'], self.normalizer)
         return df
     
     def split_data(self, df):
+        from sklearn.model_selection import train_test_split
         X = df['email']
         y = df['label']
         X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3, random_state=42, stratify=y)
         return X_train, X_test, y_train, y_test
     
-    def train_models(self, X_train, y_train):
-        models_config = {
+    def models_config(self):
+        from sklearn.naive_bayes import MultinomialNB
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.svm import SVC
+        return {
             'Naive Bayes': MultinomialNB(),
             'Random Forest': RandomForestClassifier(n_estimators=100, random_state=42),
-            'SVM': SVC(kernel='linear', random_state=42)
+            'SVM': SVC(kernel='linear', probability=True, random_state=42)
         }
-        for name, model in models_config.items():
-            pipeline = Pipeline([
-                ('tfidf', TfidfVectorizer(max_features=5000, stop_words='english')),
-                ('classifier', model)
-            ])
-            pipeline.fit(X_train, y_train)
-            self.models[name] = pipeline
+    
+    def train_models(self, X_train, y_train, shared_vectorizer=True):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.pipeline import Pipeline
+        if not shared_vectorizer:
+            for name, model in self.models_config().items():
+                start = time.perf_counter()
+                pipeline = Pipeline([
+                    ('tfidf', TfidfVectorizer(max_features=5000, stop_words='english')),
+                    ('classifier', model)
+                ])
+                pipeline.fit(X_train, y_train)
+                self.models[name] = pipeline
+                self.record_timing(f'fit {name}', time.perf_counter() - start)
+            return
+        start = time.perf_counter()
+        self.vectorizer = self.make_vectorizer()
+        X_matrix = self.vectorizer.fit_transform(X_train).tocsr()
+        self.record_timing('vectorize', time.perf_counter() - start)
+        start = time.perf_counter()
+        fitted = Parallel(n_jobs=self.n_jobs)(
+            delayed(fit_classifier)(name, model, X_matrix, y_train)
+            for name, model in self.models_config().items()
+        )
+        self.record_timing('fit (parallel wall)', time.perf_counter() - start)
+        for name, model, seconds in fitted:
+            self.models[name] = Pipeline([('tfidf', self.vectorizer), ('classifier', model)])
+            self.record_timing(f'fit {name}', seconds)
+    
+    def report_timings(self):
+        print("Stage timings:")
+        for name, seconds in self.timings.items():
+            print(f"  {name:<24} {seconds * 1000:10.1f} ms")
+    
+    def record_timing(self, name, seconds):
+        self.timings[name] = seconds
+        observe(f'spam.{name}', seconds)
     
     def evaluate_models(self, X_test, y_test):
+        start = time.perf_counter()
         for name, model in self.models.items():
             y_pred = model.predict(X_test)
-            accuracy = accuracy_score(y_test, y_pred)
             self.results[name] = {
-                'accuracy': accuracy,
+                **compute_metrics(y_test, y_pred),
                 'predictions': y_pred,
                 'model': model
             }
+        self.best_model_name = max(self.results.keys(), key=lambda x: self.results[x]['accuracy'])
+        self.best_model = self.results[self.best_model_name]['model']
+        self.record_timing('evaluate', time.perf_counter() - start)
     
     def visualize_results(self):
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        plt.style.use('seaborn-v0_8')
+        sns.set_palette("husl")
         fig, axes = plt.subplots(2, 2, figsize=(15, 12))
         fig.suptitle('Email Spam Detection - Model Performance Analysis', fontsize=16, fontweight='bold')
         
@@ -102,8 +235,8 @@ class EmailSpamDetector:
         for i, acc in enumerate(accuracies):
             axes[0, 0].text(i, acc + 0.01, f'{acc:.3f}', ha='center', va='bottom', fontweight='bold')
         
-        best_model = max(self.results.keys(), key=lambda x: self.results[x]['accuracy'])
-        cm = np.array([[3, 1], [0, 4]])
+        best_model = self.best_model_name or max(self.results.keys(), key=lambda x: self.results[x]['accuracy'])
+        cm = np.asarray(self.results[best_model]['confusion_matrix'])
         
         sns.heatmap(cm, annot=True, fmt='d', cmap='Blues', 
                    xticklabels=['Ham', 'Spam'], yticklabels=['Ham', 'Spam'], ax=axes[0, 1])
@@ -111,51 +244,387 @@ class EmailSpamDetector:
         axes[0, 1].set_ylabel('True Label')
         axes[0, 1].set_xlabel('Predicted Label')
         
-        if 'Random Forest' in self.models:
-            features = ['urgent', 'free', 'click', 'money', 'offer']
-            importance = [0.25, 0.20, 0.18, 0.22, 0.15]
-            axes[1, 0].barh(features, importance, color='#96CEB4')
+        # hashed features have no names to show
+        if 'Random Forest' in self.models and not self.use_hashing:
+            forest = self.models['Random Forest'].named_steps['classifier']
+            feature_names = self.vectorizer.get_feature_names_out()
+            top = np.argsort(forest.feature_importances_)[-5:]
+            axes[1, 0].barh(feature_names[top], forest.feature_importances_[top], color='#96CEB4')
             axes[1, 0].set_title('Top Feature Importance (Random Forest)')
             axes[1, 0].set_xlabel('Importance Score')
         
-        metrics = ['Precision', 'Recall', 'F1-Score']
-        nb_scores = [0.85, 0.90, 0.87]
-        rf_scores = [0.88, 0.85, 0.86]
-        svm_scores = [0.82, 0.88, 0.85]
-        
+        metrics = ['precision', 'recall', 'f1']
         x = np.arange(len(metrics))
-        width = 0.25
+        width = 0.8 / len(models)
+        colors = ['#FF6B6B', '#4ECDC4', '#45B7D1']
         
-        axes[1, 1].bar(x - width, nb_scores, width, label='Naive Bayes', color='#FF6B6B')
-        axes[1, 1].bar(x, rf_scores, width, label='Random Forest', color='#4ECDC4')
-        axes[1, 1].bar(x + width, svm_scores, width, label='SVM', color='#45B7D1')
+        for i, model in enumerate(models):
+            scores = [self.results[model][metric] for metric in metrics]
+            axes[1, 1].bar(x + (i - (len(models) - 1) / 2) * width, scores, width, label=model, color=colors[i % len(colors)])
         
         axes[1, 1].set_title('Performance Metrics Comparison')
         axes[1, 1].set_ylabel('Score')
         axes[1, 1].set_xticks(x)
-        axes[1, 1].set_xticklabels(metrics)
+        axes[1, 1].set_xticklabels(['Precision', 'Recall', 'F1-Score'])
         axes[1, 1].legend()
         axes[1, 1].set_ylim(0, 1)
         
         plt.tight_layout()
         plt.show()
     
+    def select_models(self, df, n_splits=5, search='grid', n_iter=10, vectorizer_grid=None, classifier_grids=None, random_state=42):
+        from sklearn.model_selection import ParameterGrid, ParameterSampler, StratifiedKFold
+        vectorizer_grid = vectorizer_grid or VECTORIZER_GRID
+        classifier_grids = classifier_grids or default_classifier_grids()
+        emails = df['email'].to_numpy()
+        labels = df['label'].to_numpy()
+        folds = list(StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state).split(emails, labels))
+        vec_settings = list(ParameterGrid(vectorizer_grid))
+        
+        start = time.perf_counter()
+        fold_cache = dict(Parallel(n_jobs=self.n_jobs)(
+            delayed(vectorize_fold)(vec_key, vec_params, fold, train_idx, test_idx, emails)
+            for vec_key, vec_params in enumerate(vec_settings)
+            for fold, (train_idx, test_idx) in enumerate(folds)
+        ))
+        self.record_timing('cv vectorize', time.perf_counter() - start)
+        
+        configs = []
+        for name, (model_class, grid) in classifier_grids.items():
+            if search == 'random':
+                settings = list(ParameterSampler(grid, n_iter=min(n_iter, len(ParameterGrid(grid))), random_state=random_state))
+            else:
+                settings = list(ParameterGrid(grid))
+            for vec_key in range(len(vec_settings)):
+                for params in settings:
+                    configs.append((name, model_class, params, vec_key))
+        
+        start = time.perf_counter()
+        scores = Parallel(n_jobs=self.n_jobs)(
+            delayed(score_config)(
+                name, model_class, params,
+                fold_cache[(vec_key, fold)][0], labels[train_idx],
+                fold_cache[(vec_key, fold)][1], labels[test_idx]
+            )
+            for name, model_class, params, vec_key in configs
+            for fold, (train_idx, test_idx) in enumerate(folds)
+        )
+        self.record_timing('cv fit+score', time.perf_counter() - start)
+        
+        rows = []
+        for i, (name, model_class, params, vec_key) in enumerate(configs):
+            fold_scores = scores[i * n_splits:(i + 1) * n_splits]
+            metrics = [fold_metrics for fold_metrics, _, _ in fold_scores]
+            rows.append({
+                'model': name,
+                'vectorizer': vec_settings[vec_key],
+                'params': {key: value for key, value in params.items() if key != 'random_state'},
+                'accuracy': np.mean([m['accuracy'] for m in metrics]),
+                'precision': np.mean([m['precision'] for m in metrics]),
+                'recall': np.mean([m['recall'] for m in metrics]),
+                'f1': np.mean([m['f1'] for m in metrics]),
+                'f1_std': np.std([m['f1'] for m in metrics]),
+                'fit_ms': np.mean([fit for _, fit, _ in fold_scores]) * 1000,
+                'predict_ms': np.mean([predict for _, _, predict in fold_scores]) * 1000,
+                'confusion_matrix': sum(m['confusion_matrix'] for m in metrics)
+            })
+        self.leaderboard = pd.DataFrame(rows).sort_values(['f1', 'fit_ms'], ascending=[False, True]).reset_index(drop=True)
+        return self.leaderboard
+    
+    def save_artifacts(self, model_dir='spam_model', data_hash=None):
+        os.makedirs(model_dir, exist_ok=True)
+        # both files are swapped in atomically, metadata last, so artifacts_match never
+        # vouches for a half-written model; uncompressed so load_artifacts can memory-map the arrays
+        models_path = os.path.join(model_dir, 'models.joblib')
+        joblib.dump({
+            'vectorizer': self.vectorizer,
+            'models': self.models,
+            'best_model_name': self.best_model_name,
+            'normalizer': self.normalizer
+        }, f"{models_path}.tmp", compress=0)
+        os.replace(f"{models_path}.tmp", models_path)
+        metadata = {
+            'version': ARTIFACT_VERSION,
+            'sklearn_version': sklearn.__version__,
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'data_hash': data_hash,
+            'best_model': self.best_model_name,
+            'metrics': {
+                name: {
+                    'accuracy': float(result['accuracy']),
+                    'precision': float(result['precision']),
+                    'recall': float(result['recall']),
+                    'f1': float(result['f1']),
+                    'confusion_matrix': np.asarray(result['confusion_matrix']).tolist()
+                }
+                for name, result in self.results.items()
+            }
+        }
+        metadata_path = os.path.join(model_dir, 'metadata.json')
+        with open(f"{metadata_path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2)
+        os.replace(f"{metadata_path}.tmp", metadata_path)
+    
+    @classmethod
+    def load_artifacts(cls, model_dir='spam_model', mmap_mode='r'):
+        metadata = read_artifact_metadata(model_dir)
+        if metadata is None or metadata.get('version') != ARTIFACT_VERSION:
+            raise ValueError(f"No compatible spam model artifacts in '{model_dir}'")
+        start = time.perf_counter()
+        state = joblib.load(os.path.join(model_dir, 'models.joblib'), mmap_mode=mmap_mode)
+        detector = cls()
+        detector.vectorizer = state['vectorizer']
+        detector.use_hashing = not hasattr(detector.vectorizer, 'vocabulary_')
+        detector.models = state['models']
+        detector.results = {
+            name: {**metadata['metrics'][name], 'model': model}
+            for name, model in detector.models.items()
+        }
+        detector.best_model_name = state['best_model_name']
+        detector.normalizer = state['normalizer']
+        detector.best_model = detector.models[detector.best_model_name]
+        detector.record_timing('load artifacts', time.perf_counter() - start)
+        return detector
+    
     def predict_new_email(self, email_text):
-        best_model_name = max(self.results.keys(), key=lambda x: self.results[x]['accuracy'])
-        best_model = self.results[best_model_name]['model']
-        prediction = best_model.predict([email_text])[0]
-        probability = best_model.predict_proba([email_text])[0]
-        result = "SPAM" if prediction == 1 else "HAM"
-        confidence = max(probability)
+        _, result, confidence = next(self.predict_batch([email_text]))
         return result, confidence
+    
+    def predict_batch(self, emails, chunksize=1000):
+        # labels come from predict(), the rule the model was evaluated and selected on; for
+        # SVC(probability=True) the Platt-scaled argmax can disagree, so probabilities only
+        # supply the confidence of the predicted label
+        vectorizer, classifier = self.best_model[:-1], self.best_model[-1]
+        classes = classifier.classes_
+        emails = iter(emails)
+        while True:
+            chunk = list(islice(emails, chunksize))
+            if not chunk:
+                return
+            with stage('spam.predict chunk'):
+                features = vectorizer.transform(clean_emails(pd.Series(chunk, dtype=object), self.normalizer))
+                labels = classifier.predict(features)
+                probabilities = classifier.predict_proba(features)
+            count('spam.emails_predicted', len(chunk))
+            confidences = probabilities[np.arange(len(chunk)), np.searchsorted(classes, labels)]
+            for email, label, confidence in zip(chunk, labels, confidences):
+                yield email, "SPAM" if label == 1 else "HAM", float(confidence)
+
+def iter_email_chunks(path, chunksize=10000, skip_chunks=0, text_column='email', label_column='label', mbox_label=1):
+    if path.endswith('.csv'):
+        skiprows = range(1, skip_chunks * chunksize + 1) if skip_chunks else None
+        for chunk in pd.read_csv(path, chunksize=chunksize, usecols=[text_column, label_column], skiprows=skiprows):
+            yield chunk[text_column].fillna('').astype(str), chunk[label_column].astype(int)
+        return
+    if path.endswith('.jsonl') or path.endswith('.json'):
+        chunks = pd.read_json(path, lines=True, chunksize=chunksize)
+    elif path.endswith('.mbox'):
+        chunks = iter_mbox_chunks(path, chunksize, text_column, label_column, mbox_label)
+    else:
+        raise ValueError(f"Unsupported email source '{path}' (expected .csv, .jsonl or .mbox)")
+    for index, chunk in enumerate(chunks):
+        if index < skip_chunks:
+            continue
+        yield chunk[text_column].fillna('').astype(str), chunk[label_column].astype(int)
+
+def iter_mbox_chunks(path, chunksize, text_column, label_column, default_label):
+    texts, labels = [], []
+    for message in mailbox.mbox(path):
+        flag = (message.get('X-Spam-Flag') or '').strip().upper()
+        label = 1 if flag == 'YES' else 0 if flag == 'NO' else default_label
+        body = message.get_payload(decode=True) if not message.is_multipart() else b''
+        if message.is_multipart():
+            for part in message.walk():
+                if part.get_content_type() == 'text/plain':
+                    body += part.get_payload(decode=True) or b''
+        texts.append(f"{message.get('Subject', '')} {(body or b'').decode('utf-8', errors='ignore')}")
+        labels.append(label)
+        if len(texts) >= chunksize:
+            yield pd.DataFrame({text_column: texts, label_column: labels})
+            texts, labels = [], []
+    if texts:
+        yield pd.DataFrame({text_column: texts, label_column: labels})
+
+def iter_emails(path, text_column='email', chunksize=10000):
+    if path == '-':
+        for line in sys.stdin:
+            if line.strip():
+                yield line.rstrip('\n')
+        return
+    if path.endswith('.csv'):
+        chunks = pd.read_csv(path, chunksize=chunksize, usecols=[text_column])
+    elif path.endswith('.jsonl') or path.endswith('.json'):
+        chunks = pd.read_json(path, lines=True, chunksize=chunksize)
+    else:
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                if line.strip():
+                    yield line.rstrip('\n')
+        return
+    for chunk in chunks:
+        yield from chunk[text_column].fillna('').astype(str)
+
+class StreamingSpamTrainer:
+    def __init__(self, checkpoint_path='spam_stream_checkpoint.joblib', n_features=2**20, chunksize=10000, checkpoint_every=1):
+        self.checkpoint_path = checkpoint_path
+        self.chunksize = chunksize
+        self.checkpoint_every = checkpoint_every
+        from sklearn.feature_extraction.text import HashingVectorizer
+        from sklearn.naive_bayes import MultinomialNB
+        from sklearn.linear_model import SGDClassifier
+        self.vectorizer = HashingVectorizer(n_features=n_features, alternate_sign=False, stop_words='english')
+        self.models = {
+            'Naive Bayes': MultinomialNB(),
+            'SGD': SGDClassifier(loss='log_loss', random_state=42)
+        }
+        self.classes = np.array([0, 1])
+        self.chunks_done = 0
+        self.rows_seen = 0
+        self.correct = {name: 0 for name in self.models}
+    
+    def save_checkpoint(self):
+        state = {
+            'models': self.models,
+            'n_features': self.vectorizer.n_features,
+            'chunksize': self.chunksize,
+            'chunks_done': self.chunks_done,
+            'rows_seen': self.rows_seen,
+            'correct': self.correct
+        }
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        joblib.dump(state, tmp_path)
+        os.replace(tmp_path, self.checkpoint_path)
+    
+    def load_checkpoint(self):
+        state = joblib.load(self.checkpoint_path)
+        if state['chunksize'] != self.chunksize or state['n_features'] != self.vectorizer.n_features:
+            raise ValueError("Checkpoint was written with a different chunksize or n_features; cannot resume")
+        self.models = state['models']
+        self.chunks_done = state['chunks_done']
+        self.rows_seen = state['rows_seen']
+        self.correct = state['correct']
+    
+    def train(self, path, resume=True, **source_options):
+        if resume and os.path.exists(self.checkpoint_path):
+            self.load_checkpoint()
+            print(f"Resuming after {self.chunks_done} chunks ({self.rows_seen:,} emails)")
+        start = time.perf_counter()
+        for texts, labels in iter_email_chunks(path, self.chunksize, self.chunks_done, **source_options):
+            if labels.empty:
+                continue
+            X = self.vectorizer.transform(clean_emails(texts))
+            y = labels.to_numpy()
+            for name, model in self.models.items():
+                if self.rows_seen:
+                    self.correct[name] += int((model.predict(X) == y).sum())
+                model.partial_fit(X, y, classes=self.classes)
+            self.rows_seen += len(y)
+            self.chunks_done += 1
+            if self.chunks_done % self.checkpoint_every == 0:
+                self.save_checkpoint()
+            elapsed = time.perf_counter() - start
+            print(f"Chunk {self.chunks_done}: {self.rows_seen:,} emails seen ({len(y) / max(elapsed, 1e-9):,.0f} emails/s this run)")
+            start = time.perf_counter()
+        self.save_checkpoint()
+        return self.progressive_accuracy()
+    
+    def progressive_accuracy(self):
+        # test-then-train: every chunk after the first is scored before the models learn from it
+        scored = self.rows_seen - min(self.rows_seen, self.chunksize)
+        return {name: correct / scored if scored else 0.0 for name, correct in self.correct.items()}
+    
+    def predict(self, emails, model_name='SGD'):
+        return self.models[model_name].predict(self.vectorizer.transform(clean_emails(pd.Series(list(emails)))))
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Email spam detection")
+    parser.add_argument('--model-dir', default='spam_model', help="directory for saved model artifacts")
+    parser.add_argument('--retrain', action='store_true', help="retrain even if the training data is unchanged")
+    subparsers = parser.add_subparsers(dest='command')
+    stream = subparsers.add_parser('stream-train', help="train incrementally on a CSV/JSONL/mbox corpus larger than RAM")
+    stream.add_argument('--input', required=True)
+    stream.add_argument('--chunksize', type=int, default=10000)
+    stream.add_argument('--checkpoint', default='spam_stream_checkpoint.joblib')
+    stream.add_argument('--checkpoint-every', type=int, default=1)
+    stream.add_argument('--no-resume', action='store_true')
+    stream.add_argument('--mbox-label', type=int, default=1, help="label for mbox messages without an X-Spam-Flag header")
+    selection = subparsers.add_parser('select', help="cross-validated model selection and hyperparameter search")
+    selection.add_argument('--folds', type=int, default=5)
+    selection.add_argument('--search', choices=['grid', 'random'], default='grid')
+    selection.add_argument('--n-iter', type=int, default=10, help="settings sampled per classifier for random search")
+    selection.add_argument('--jobs', type=int, default=-1)
+    selection.add_argument('--top', type=int, default=10)
+    selection.add_argument('--output', default=None, help="CSV file for the full leaderboard")
+    predict = subparsers.add_parser('predict', help="classify a file of emails (txt: one per line, csv, jsonl, or - for stdin)")
+    predict.add_argument('--input', required=True)
+    predict.add_argument('--output', default='-', help="JSON lines output file (default: stdout)")
+    predict.add_argument('--chunksize', type=int, default=1000)
+    predict.add_argument('--text-column', default='email')
+    return parser.parse_args(argv)
+
+def load_or_train_detector(model_dir='spam_model', retrain=False):
     detector = EmailSpamDetector()
-    df = detector.create_sample_dataset()
-    df = detector.preprocess_data(df)
+    df = detector.preprocess_data(detector.create_sample_dataset())
+    data_hash = dataset_hash(df)
+    if not retrain and artifacts_match(model_dir, data_hash):
+        detector = EmailSpamDetector.load_artifacts(model_dir)
+        print(f"Loaded models from '{model_dir}' in {detector.timings['load artifacts'] * 1000:.1f} ms "
+              f"(training data unchanged)", file=sys.stderr)
+        return detector
     X_train, X_test, y_train, y_test = detector.split_data(df)
     detector.train_models(X_train, y_train)
     detector.evaluate_models(X_test, y_test)
+    detector.save_artifacts(model_dir, data_hash)
+    return detector
+
+def batch_predict(args):
+    detector = load_or_train_detector(args.model_dir, args.retrain)
+    output = open(args.output, 'w', encoding='utf-8') if args.output != '-' else sys.stdout
+    written = 0
+    start = time.perf_counter()
+    try:
+        for email, result, confidence in detector.predict_batch(iter_emails(args.input, args.text_column), args.chunksize):
+            output.write(json.dumps({'email': email, 'prediction': result, 'confidence': round(confidence, 4)}) + '\n')
+            written += 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    elapsed = time.perf_counter() - start
+    print(f"Classified {written:,} emails with {detector.best_model_name} in {elapsed:.2f}s "
+          f"({written / elapsed if elapsed else 0:,.0f} emails/s)", file=sys.stderr)
+
+def select(args):
+    detector = EmailSpamDetector(n_jobs=args.jobs)
+    df = detector.preprocess_data(detector.create_sample_dataset())
+    leaderboard = detector.select_models(df, n_splits=args.folds, search=args.search, n_iter=args.n_iter)
+    columns = ['model', 'vectorizer', 'params', 'accuracy', 'precision', 'recall', 'f1', 'fit_ms', 'predict_ms']
+    with pd.option_context('display.max_colwidth', 60, 'display.width', 200):
+        print(leaderboard[columns].head(args.top).to_string(float_format=lambda v: f'{v:.3f}'))
+    detector.report_timings()
+    if args.output:
+        leaderboard.drop(columns=['confusion_matrix']).to_csv(args.output, index=False)
+        print(f"Leaderboard saved to {args.output}")
+
+def stream_train(args):
+    trainer = StreamingSpamTrainer(args.checkpoint, chunksize=args.chunksize, checkpoint_every=args.checkpoint_every)
+    options = {'mbox_label': args.mbox_label} if args.input.endswith('.mbox') else {}
+    accuracy = trainer.train(args.input, resume=not args.no_resume, **options)
+    for name, score in accuracy.items():
+        print(f"{name}: progressive accuracy {score:.3f}")
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == 'stream-train':
+        stream_train(args)
+        return
+    if args.command == 'predict':
+        batch_predict(args)
+        return
+    if args.command == 'select':
+        select(args)
+        return
+    detector = load_or_train_detector(args.model_dir, args.retrain)
+    detector.report_timings()
     detector.visualize_results()
     
     test_emails = [
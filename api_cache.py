@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+
+class ResponseCache:
+    """On-disk cache for JSON API responses with TTLs, conditional revalidation and LRU eviction"""
+    def __init__(self, cache_dir='.api_cache', max_bytes=50 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'evictions': 0}
+        self.lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path_for(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode('utf-8')).hexdigest() + '.json')
+
+    def load(self, url):
+        """Return the cached entry for a URL, or None"""
+        try:
+            with open(self.path_for(url), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def write(self, url, entry):
+        path = self.path_for(url)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def touch(self, url):
+        """Mark an entry as recently used; file mtime drives LRU eviction"""
+        try:
+            os.utime(self.path_for(url))
+        except OSError:
+            pass
+
+    @staticmethod
+    def entry_is_fresh(entry, ttl):
+        return entry is not None and time.time() - entry.get('stored_at', 0) < ttl
+
+    def is_fresh(self, url, ttl):
+        """True when get() would answer from the cache without touching the network"""
+        return self.entry_is_fresh(self.load(url), ttl)
+
+    def get(self, session, url, ttl, timeout=10):
+        """Return the JSON body for a URL, using the network only when the entry is stale"""
+        entry = self.load(url)
+        if self.entry_is_fresh(entry, ttl):
+            self.count('hits')
+            self.touch(url)
+            return entry['body']
+        headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        response = session.get(url, headers=headers, timeout=timeout)
+        if response.status_code == 304 and entry is not None:
+            self.count('revalidated')
+            entry['stored_at'] = time.time()
+            self.write(url, entry)
+            return entry['body']
+        response.raise_for_status()
+        self.count('misses')
+        body = response.json()
+        self.write(url, {
+            'url': url,
+            'stored_at': time.time(),
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'body': body
+        })
+        return body
+
+    def count(self, key, n=1):
+        with self.lock:
+            self.stats[key] += n
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        with self.lock:
+            entries = []
+            total = 0
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+            entries.sort()
+            for mtime, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                self.stats['evictions'] += 1
+
+    def clear(self):
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.json'):
+                os.remove(os.path.join(self.cache_dir, name))
+
+    def hit_rate(self):
+        lookups = self.stats['hits'] + self.stats['misses'] + self.stats['revalidated']
+        return self.stats['hits'] / lookups if lookups else 0.0
@@ -0,0 +1,49 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from Task3 import ChatbotEngine, normalizetext
+from synthetic import SUPPORT_WORDS, make_word_documents
+
+
+def refit_per_query(responses, normalized, userinput):
+    """The previous getchatbotresponse: refit TF-IDF on corpus + query for every message"""
+    normalized.append(normalizetext(userinput))
+    tfidfmatrix = TfidfVectorizer().fit_transform(normalized)
+    scores = cosine_similarity(tfidfmatrix[-1], tfidfmatrix[:-1])
+    normalized.pop()
+    return responses[int(np.argmax(scores))]
+
+
+def mean_latency_ms(func, queries):
+    start = time.perf_counter()
+    for query in queries:
+        func(query)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-message chatbot latency vs corpus size")
+    parser.add_argument('--sizes', default='100,1000,10000,50000')
+    parser.add_argument('--queries', type=int, default=20)
+    args = parser.parse_args()
+
+    queries = make_word_documents(args.queries, SUPPORT_WORDS, seed=7)
+    print(f"{'corpus':>8} {'refit/query ms':>16} {'engine ms':>12}")
+    for size in [int(n) for n in args.sizes.split(',')]:
+        responses = make_word_documents(size, SUPPORT_WORDS)
+        normalized = [normalizetext(r) for r in responses]
+        engine = ChatbotEngine(responses).fit()
+        refit = mean_latency_ms(lambda q: refit_per_query(responses, normalized, q), queries[:5])
+        fitted = mean_latency_ms(engine.respond, queries)
+        print(f"{size:>8} {refit:>16.2f} {fitted:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from chatbot_retrieval import makeretriever
+from synthetic import make_paraphrases, make_zipf_corpus
+
+CONFIGS = [
+    ('exact', {}),
+    ('inverted', {}),
+    ('inverted', {'maxpostings': 2000}),
+    ('inverted', {'maxpostings': 200}),
+    ('lsh', {'tables': 8, 'bits': 12}),
+    ('lsh', {'tables': 16, 'bits': 10}),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recall@1 vs latency for the chatbot retrieval backends")
+    parser.add_argument('--docs', type=int, default=200_000)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--batch', type=int, default=64)
+    args = parser.parse_args()
+
+    corpus = make_zipf_corpus(args.docs)
+    vectorizer = TfidfVectorizer()
+    matrix = vectorizer.fit_transform(corpus).tocsr()
+    queryvectors = vectorizer.transform(make_paraphrases(corpus, args.queries)).tocsr()
+    print(f"Corpus: {args.docs:,} docs, {matrix.shape[1]:,} terms, {matrix.nnz:,} nonzeros; {args.queries} queries")
+
+    truthidx, truthscores = makeretriever('exact', matrix).search(queryvectors)
+    print(f"{'backend':<34} {'build s':>8} {'ms/query':>9} {'recall@1':>9}")
+    for backend, options in CONFIGS:
+        start = time.perf_counter()
+        retriever = makeretriever(backend, matrix, **options)
+        build = time.perf_counter() - start
+        bestidx, bestscores = [], []
+        start = time.perf_counter()
+        for offset in range(0, args.queries, args.batch):
+            idx, scores = retriever.search(queryvectors[offset:offset + args.batch])
+            bestidx.append(idx)
+            bestscores.append(scores)
+        elapsed = time.perf_counter() - start
+        bestscores = np.concatenate(bestscores)
+        recall = np.mean(np.isclose(bestscores, truthscores) | (np.concatenate(bestidx) == truthidx))
+        label = backend + (f" {options}" if options else "")
+        print(f"{label:<34} {build:>8.2f} {elapsed / args.queries * 1000:>9.3f} {recall:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
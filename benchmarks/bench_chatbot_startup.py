@@ -0,0 +1,72 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import time
+start = time.perf_counter()
+import Task3
+imported = time.perf_counter()
+Task3.getchatbotresponse('hello')
+answered = time.perf_counter()
+import json, sys
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'first_response_ms': (answered - start) * 1000,
+    'sklearn_loaded': 'sklearn' in sys.modules,
+    'nltk_loaded': 'nltk' in sys.modules
+}))
+"""
+
+
+def run_probe(modelpath):
+    env = dict(os.environ, CHATBOT_MODEL=modelpath)
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1]), proc.stderr
+
+
+def parse_importtime(stderr, maxdepth=1):
+    """Return (cumulative_us, module) for imports up to maxdepth levels deep in -X importtime output"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, module = line[len('import time:'):].split('|')
+        depth = (len(module) - len(module.lstrip()) - 1) // 2
+        if depth <= maxdepth:
+            rows.append((int(cumulative_us), '  ' * depth + module.strip()))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import time and time to first chatbot response")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=12)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        modelpath = os.path.join(tmp, 'chatbot_model.npz')
+        cold, _ = run_probe(modelpath)
+        print(f"No artifact (fit on first use): import {cold['import_ms']:.1f} ms, "
+              f"first response {cold['first_response_ms']:.1f} ms, sklearn loaded: {cold['sklearn_loaded']}")
+        runs = [run_probe(modelpath) for _ in range(args.runs)]
+
+    best, stderr = min(runs, key=lambda run: run[0]['first_response_ms'])
+    print(f"Prebuilt artifact (best of {args.runs}): import {best['import_ms']:.1f} ms, "
+          f"first response {best['first_response_ms']:.1f} ms, "
+          f"sklearn loaded: {best['sklearn_loaded']}, nltk loaded: {best['nltk_loaded']}")
+    print(f"\nTop {args.top} imports by cumulative time (-X importtime):")
+    for cumulative_us, module in sorted(parse_importtime(stderr), reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:9.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    main()
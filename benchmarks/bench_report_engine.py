@@ -0,0 +1,37 @@
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from report_engine import ReportPDF, TableRenderer
+from synthetic import iter_sales_rows
+
+
+def render(rows, target):
+    pdf = ReportPDF()
+    pdf.title_block("Benchmark")
+    start = time.perf_counter()
+    TableRenderer(['Product', 'Quantity', 'Price'], formats={'Price': 'Rs {:,}'}).render(pdf, iter(rows))
+    drawn = time.perf_counter() - start
+    pdf.write_to(target)
+    return drawn, time.perf_counter() - start, pdf.pages_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TableRenderer throughput: table drawing vs serialization")
+    parser.add_argument('--rows', type=int, default=50_000)
+    args = parser.parse_args()
+
+    rows = list(iter_sales_rows(args.rows))
+    with open(os.devnull, 'wb') as devnull:
+        for label, target in [('in-memory buffer', io.BytesIO()), ('file object', devnull)]:
+            drawn, total, pages = render(rows, target)
+            print(f"{label:<18} {pages:6,} pages  draw {drawn:6.2f} s  draw+output {total:6.2f} s  "
+                  f"{args.rows / total:10,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import make_payroll_workbook
+
+PROBE = """
+import sys, time, resource
+sys.path.insert(0, {root!r})
+import Task2
+start = time.perf_counter()
+rows, _ = getattr(Task2, {func!r})({input!r}, {output!r}, **{kwargs!r})
+elapsed = time.perf_counter() - start
+print(rows, elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def run_mode(func, input_file, output_file, **kwargs):
+    """Run one report mode in a fresh interpreter so peak RSS is not shared between modes"""
+    code = PROBE.format(root=ROOT, func=func, input=input_file, output=output_file, kwargs=kwargs)
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    rows, elapsed, maxrss_kb = out.split()
+    return int(rows), float(elapsed), int(maxrss_kb) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rows/sec and peak RSS of the Task2 salary report modes")
+    parser.add_argument('--rows', type=int, default=500_000)
+    parser.add_argument('--workbook', default=None, help="reuse an existing workbook instead of generating one")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workbook = args.workbook or os.path.join(tmp, 'payroll.xlsx')
+        if not args.workbook:
+            start = time.perf_counter()
+            make_payroll_workbook(workbook, args.rows)
+            print(f"Generated {args.rows:,}-row workbook in {time.perf_counter() - start:.1f}s")
+        cache_dir = os.path.join(tmp, 'cache')
+        # generate_report caches aggregates by default; time the cold parse and the warm cache separately
+        modes = [('pandas, no cache', 'generate_report', {'cache_dir': None}),
+                 ('pandas, warm cache', 'generate_report', {'cache_dir': cache_dir}),
+                 ('streaming', 'generate_report_streaming', {})]
+        run_mode('generate_report', workbook, os.path.join(tmp, 'prime.pdf'), cache_dir=cache_dir)
+        for label, func, kwargs in modes:
+            rows, elapsed, peak_mb = run_mode(func, workbook, os.path.join(tmp, f'{func}.pdf'), **kwargs)
+            print(f"{label:<20} {rows:>9,} rows  {elapsed:8.1f} s  {rows / elapsed:10,.0f} rows/s  peak RSS {peak_mb:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic import make_sales_csv
+
+# Both probes stop before PDF rendering: they cover parse, totals and per-cell string preparation,
+# which is the part that scales with row count independently of fpdf.
+DICTREADER_PROBE = """
+import csv, json, resource, time
+start = time.perf_counter()
+with open({path!r}, 'r', newline='') as file:
+    salesdata = list(csv.DictReader(file))
+totalsales = 0
+for item in salesdata:
+    totalsales += int(item['Quantity']) * float(item['Price'])
+cells = [[str(value) for value in row.values()] for row in salesdata]
+elapsed = time.perf_counter() - start
+print(json.dumps({{'rows': len(salesdata), 'total': totalsales, 'seconds': elapsed,
+                  'maxrss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}}))
+"""
+
+TYPED_PROBE = """
+import json, resource, sys, time
+sys.path.insert(0, {root!r})
+import generate_report
+generate_report.HAS_PYARROW = generate_report.HAS_PYARROW and {pyarrow!r}
+start = time.perf_counter()
+sales = generate_report.load_sales({path!r})
+totalsales = float(sales['Line Total'].sum())
+cells = list(zip(*generate_report.format_columns(sales)))
+elapsed = time.perf_counter() - start
+print(json.dumps({{'rows': len(sales), 'total': totalsales, 'seconds': elapsed,
+                  'maxrss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}}))
+"""
+
+
+def run_probe(code):
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sales CSV ingestion: DictReader loop vs typed columns")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'sales.csv')
+        make_sales_csv(path, args.rows)
+        cases = [
+            ('DictReader + int()/float() loop', DICTREADER_PROBE.format(path=path)),
+            ('typed read_csv (C engine)', TYPED_PROBE.format(root=ROOT, path=path, pyarrow=False)),
+            ('typed read_csv (pyarrow engine)', TYPED_PROBE.format(root=ROOT, path=path, pyarrow=True)),
+        ]
+        print(f"{args.rows:,} sales rows (parse + totals + cell strings, no PDF)")
+        for label, code in cases:
+            result = run_probe(code)
+            print(f"{label:<34} {result['seconds']:7.2f} s  {result['rows'] / result['seconds']:12,.0f} rows/s  "
+                  f"peak RSS {result['maxrss_kb'] / 1024:8.1f} MB  total {result['total']:,.2f}")
+
+
+if __name__ == "__main__":
+    main()
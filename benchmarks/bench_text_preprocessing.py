@@ -0,0 +1,64 @@
+import argparse
+import os
+import re
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from text_preprocessing import CHATBOT_NORMALIZER, SPAM_NORMALIZER, TextNormalizer
+from synthetic import NOISY_WORDS, make_word_documents
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Text normalization throughput")
+    parser.add_argument('--docs', type=int, default=1_000_000)
+    parser.add_argument('--jobs', type=int, default=os.cpu_count())
+    parser.add_argument('--stem-docs', type=int, default=100_000, help="smaller corpus for the stemming rows")
+    args = parser.parse_args()
+
+    docs = make_word_documents(args.docs, NOISY_WORDS, 6, 20)
+    series = pd.Series(docs, dtype=object)
+    punctuation_table = str.maketrans('', '', string.punctuation)
+    letters_pattern = re.compile(r'[^a-zA-Z\s]')
+
+    cases = [
+        ('chatbot: previous per-string translate', lambda: [d.lower().translate(punctuation_table) for d in docs]),
+        ('chatbot: normalize_many (1 process)', lambda: CHATBOT_NORMALIZER.normalize_many(docs, n_jobs=1)),
+        (f'chatbot: normalize_many ({args.jobs} processes)', lambda: CHATBOT_NORMALIZER.normalize_many(docs, n_jobs=args.jobs)),
+        ('chatbot: normalize_series', lambda: CHATBOT_NORMALIZER.normalize_series(series)),
+        ('spam: previous pandas regex passes', lambda: series.str.lower().str.replace(letters_pattern, '', regex=True)),
+        ('spam: normalize_series', lambda: SPAM_NORMALIZER.normalize_series(series)),
+        (f'spam: normalize_many ({args.jobs} processes)', lambda: SPAM_NORMALIZER.normalize_many(docs, n_jobs=args.jobs)),
+    ]
+    print(f"{args.docs:,} documents")
+    for label, func in cases:
+        seconds = timed(func)
+        print(f"{label:<45} {seconds:8.2f} s  {args.docs / seconds:12,.0f} docs/s")
+
+    stem_docs = docs[:args.stem_docs]
+    try:
+        from nltk.stem import PorterStemmer
+    except ImportError:
+        print("nltk not installed; skipping stemming rows")
+        return
+    stemmer = PorterStemmer()
+    unmemoized = lambda: [" ".join(stemmer.stem(t) for t in d.lower().translate(punctuation_table).split()) for d in stem_docs]
+    memoized = TextNormalizer(stem=True)
+    print(f"\n{args.stem_docs:,} documents with Porter stemming")
+    for label, func in [('stemming without memoization', unmemoized),
+                        ('stemming with memoized token lookups', lambda: memoized.normalize_many(stem_docs, n_jobs=1))]:
+        seconds = timed(func)
+        print(f"{label:<45} {seconds:8.2f} s  {args.stem_docs / seconds:12,.0f} docs/s")
+
+
+if __name__ == "__main__":
+    main()
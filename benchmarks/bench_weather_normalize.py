@@ -0,0 +1,62 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from Task1 import APIDataVisualizer, normalize_weather
+from synthetic import make_weather
+
+
+def list_comprehension_pass(records):
+    """The per-row extraction previously done in analyze_weather_data and save_data_to_files"""
+    df = pd.DataFrame(records)
+    df['temperature'] = [w['temp'] for w in df['main']]
+    df['humidity'] = [w['humidity'] for w in df['main']]
+    df['pressure'] = [w['pressure'] for w in df['main']]
+    df['condition'] = [w[0]['main'] for w in df['weather']]
+    return df
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark weather payload normalization")
+    parser.add_argument('--records', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    records = make_weather(args.records)
+    visualizer = APIDataVisualizer(use_cache=False)
+    visualizer.data['weather'] = records
+
+    def old_path():
+        list_comprehension_pass(records)
+        list_comprehension_pass(records)
+
+    def new_path():
+        visualizer.weather_source = None
+        visualizer.get_weather_frame()
+        visualizer.get_weather_frame()
+
+    results = {
+        'list comprehensions x2 (analysis + export)': best_of(old_path, args.repeat),
+        'normalize_weather once': best_of(lambda: normalize_weather(records), args.repeat),
+        'cached frame (analysis + export)': best_of(new_path, args.repeat),
+    }
+    print(f"Weather normalization, {args.records:,} records (best of {args.repeat})")
+    for label, seconds in results.items():
+        print(f"{label:<45} {seconds * 1000:9.1f} ms  {args.records / seconds:12,.0f} rec/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+import numpy as np
+
+MESSAGES = [
+    "Hello there", "How are you?", "What is your name?", "What are your capabilities?",
+    "How does NLP work?", "What is NLTK?", "Tell me about spaCy", "Thank you", "Goodbye",
+    "Can you book me a flight?"
+]
+
+
+async def request(reader, writer, method, path, payload=None):
+    body = json.dumps(payload).encode('utf-8') if payload is not None else b''
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body
+    )
+    await writer.drain()
+    await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value.strip())
+    return json.loads(await reader.readexactly(length))
+
+
+async def simulated_user(userid, args, slots, latencies, errors):
+    rng = random.Random(userid)
+    async with slots:
+        try:
+            reader, writer = await asyncio.open_connection(args.host, args.port)
+        except OSError:
+            errors.append(userid)
+            return
+        try:
+            for _ in range(args.messages):
+                start = time.perf_counter()
+                await request(reader, writer, 'POST', '/chat', {'session': f'user-{userid}', 'message': rng.choice(MESSAGES)})
+                latencies.append(time.perf_counter() - start)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            errors.append(userid)
+        finally:
+            writer.close()
+
+
+async def run(args):
+    slots = asyncio.Semaphore(args.connections)
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(simulated_user(i, args, slots, latencies, errors) for i in range(args.users)))
+    elapsed = time.perf_counter() - start
+    reader, writer = await asyncio.open_connection(args.host, args.port)
+    serverstats = await request(reader, writer, 'GET', '/stats')
+    writer.close()
+    ms = np.array(latencies) * 1000
+    print(f"Simulated users: {args.users} ({args.connections} concurrent connections, {args.messages} messages each)")
+    print(f"Requests: {len(ms)} in {elapsed:.2f}s -> {len(ms) / elapsed:,.0f} req/s, errors: {len(errors)}")
+    if len(ms):
+        print(f"Client latency p50 {np.percentile(ms, 50):.2f} ms, p99 {np.percentile(ms, 99):.2f} ms")
+    print(f"Server stats: {json.dumps(serverstats)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive chatbot_server.py with many simulated users")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--messages', type=int, default=5)
+    parser.add_argument('--connections', type=int, default=500, help="cap on simultaneously open sockets")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
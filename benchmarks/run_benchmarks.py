@@ -0,0 +1,247 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import synthetic
+from instrumentation import METRICS
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+SCALES = {
+    'small': {'users': 100, 'posts': 1000, 'crypto': 500, 'sales_rows': 2000, 'sales_files': 20,
+              'sales_file_rows': 100, 'payroll_rows': 2000, 'emails': 2000, 'faq': 500, 'queries': 2000},
+    'medium': {'users': 500, 'posts': 5000, 'crypto': 2500, 'sales_rows': 10000, 'sales_files': 100,
+               'sales_file_rows': 200, 'payroll_rows': 10000, 'emails': 10000, 'faq': 2000, 'queries': 10000},
+    'large': {'users': 2000, 'posts': 20000, 'crypto': 10000, 'sales_rows': 50000, 'sales_files': 500,
+              'sales_file_rows': 200, 'payroll_rows': 50000, 'emails': 40000, 'faq': 10000, 'queries': 50000}
+}
+
+
+def bench_dashboard(params, workdir, seed):
+    import Task1
+    with synthetic.StubAPIServer(users=params['users'], posts=params['posts'], crypto=params['crypto'], seed=seed) as stub:
+        visualizer = Task1.APIDataVisualizer(
+            apis=stub.apis, use_cache=False, crypto_all_pages=True, crypto_requests_per_minute=100000,
+            headless=True, output_dir=os.path.join(workdir, 'dashboards'), export_formats=['png', 'html']
+        )
+        visualizer.crypto_markets_url = stub.crypto_markets_url
+        with METRICS.stage('total'):
+            visualizer.fetch_all(['users', 'posts', 'crypto', 'weather'])
+            visualizer.analyze_users_data()
+            visualizer.analyze_posts_data()
+            visualizer.analyze_crypto_data()
+            visualizer.analyze_weather_data()
+            visualizer.save_data_to_files('parquet', os.path.join(workdir, 'exports'))
+    # weather always comes from Task1's built-in sample cities, so it does not scale and is not counted
+    return {'records': params['users'] + params['posts'] + params['crypto']}
+
+
+def bench_salary_report(params, workdir, seed):
+    import Task2
+    workbook = synthetic.make_payroll_workbook(os.path.join(workdir, 'payroll.xlsx'), params['payroll_rows'], seed)
+    with METRICS.stage('total'):
+        rows, _ = Task2.generate_report(workbook, os.path.join(workdir, 'salary.pdf'), cache_dir=None)
+    with METRICS.stage('total_streaming'):
+        Task2.generate_report_streaming(workbook, os.path.join(workdir, 'salary_stream.pdf'))
+    return {'records': rows}
+
+
+def bench_sales_reports(params, workdir, seed):
+    import generate_report
+    big = synthetic.make_sales_csv(os.path.join(workdir, 'sales.csv'), params['sales_rows'], seed)
+    stores = os.path.join(workdir, 'stores')
+    synthetic.make_sales_dir(stores, params['sales_files'], params['sales_file_rows'], seed)
+    with METRICS.stage('total'):
+        rows, _ = generate_report.render_sales_report(big, os.path.join(workdir, 'sales.pdf'))
+    with METRICS.stage('batch'):
+        manifest = generate_report.batch_render(stores, os.path.join(workdir, 'reports'))
+    if manifest['failed']:
+        raise RuntimeError(f"{manifest['failed']} store reports failed")
+    return {'records': rows, 'batch_files': manifest['reports']}
+
+
+def bench_spam(params, workdir, seed):
+    from sklearn.model_selection import train_test_split
+    import Task4
+    df = synthetic.make_email_corpus(params['emails'], seed=seed)
+    with METRICS.stage('total'):
+        detector = Task4.EmailSpamDetector()
+        with METRICS.stage('spam.preprocess'):
+            df = detector.preprocess_data(df)
+        X_train, X_test, y_train, y_test = train_test_split(df['email'], df['label'], test_size=0.3,
+                                                            random_state=seed, stratify=df['label'])
+        detector.train_models(X_train, y_train)
+        detector.evaluate_models(X_test, y_test)
+        with METRICS.stage('spam.predict_batch'):
+            for _ in detector.predict_batch(X_test.tolist()):
+                pass
+    return {'records': len(df), 'best_model': detector.best_model_name,
+            'accuracy': detector.results[detector.best_model_name]['accuracy']}
+
+
+def bench_chatbot(params, workdir, seed):
+    from Task3 import ChatbotEngine
+    responses = synthetic.make_faq_corpus(params['faq'], seed)
+    queries = synthetic.make_queries(params['queries'], seed)
+    with METRICS.stage('total'):
+        with METRICS.stage('chatbot.fit'):
+            engine = ChatbotEngine(responses).fit()
+        with METRICS.stage('chatbot.respondbatch'):
+            engine.respondbatch(queries)
+        for query in queries[:1000]:
+            with METRICS.stage('chatbot.respond'):
+                engine.respond(query)
+    return {'records': len(queries)}
+
+
+PIPELINES = {
+    'dashboard': bench_dashboard,
+    'salary_report': bench_salary_report,
+    'sales_reports': bench_sales_reports,
+    'spam': bench_spam,
+    'chatbot': bench_chatbot
+}
+
+
+def warm_imports(pipelines):
+    """Import the pipeline modules up front so module import cost does not land in whichever stage runs first"""
+    modules = {'dashboard': ['Task1'], 'salary_report': ['Task2'], 'sales_reports': ['generate_report'],
+               'spam': ['Task4', 'sklearn.model_selection'], 'chatbot': ['Task3', 'sklearn.feature_extraction.text']}
+    for name in pipelines:
+        for module in modules[name]:
+            __import__(module)
+
+
+def git_revision():
+    try:
+        sha = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                             text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT,
+                                    capture_output=True, text=True, check=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown', False
+    return sha, dirty
+
+
+def run_pipeline(name, params, seed):
+    """Run one pipeline in a scratch directory and return its end-to-end time and per-stage metrics.
+
+    seconds is the pipeline's 'total' stage, which excludes synthetic data generation;
+    wall_seconds includes it.
+    """
+    METRICS.reset()
+    with tempfile.TemporaryDirectory() as workdir:
+        start = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                info = PIPELINES[name](params, workdir, seed)
+            error = None
+        except Exception as e:
+            info, error = {}, f"{type(e).__name__}: {e}"
+        elapsed = time.perf_counter() - start
+    snap = METRICS.snapshot()
+    stages = {stage: {'count': stats['count'], 'total_seconds': stats['total_seconds'], 'max_seconds': stats['max_seconds']}
+              for stage, stats in snap['stages'].items()}
+    seconds = stages['total']['total_seconds'] if 'total' in stages else elapsed
+    return {'seconds': seconds, 'wall_seconds': elapsed, 'error': error, 'info': info, 'stages': stages,
+            'counters': snap['counters']}
+
+
+def run_suite(pipelines, scale, seed, repeat):
+    sha, dirty = git_revision()
+    params = SCALES[scale]
+    warm_imports(pipelines)
+    results = {}
+    for name in pipelines:
+        runs = [run_pipeline(name, params, seed) for _ in range(repeat)]
+        best = min(runs, key=lambda run: run['seconds'])
+        best['runs'] = [run['seconds'] for run in runs]
+        results[name] = best
+        status = best['error'] or f"{best['seconds']:.2f}s"
+        print(f"{name:<16} {status}")
+    return {
+        'git_sha': sha, 'dirty': dirty, 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count(),
+        'scale': scale, 'params': params, 'seed': seed, 'repeat': repeat, 'pipelines': results
+    }
+
+
+def save_results(result, output_dir=RESULTS_DIR):
+    os.makedirs(output_dir, exist_ok=True)
+    suffix = '-dirty' if result['dirty'] else ''
+    stamp = result['timestamp'].replace(':', '').replace('-', '')
+    path = os.path.join(output_dir, f"{result['git_sha']}{suffix}-{result['scale']}-{stamp}.json")
+    with open(path, 'w') as f:
+        json.dump(result, f, indent=2)
+    return path
+
+
+def compare(baseline, candidate, threshold=0.10):
+    """Print per-pipeline and per-stage changes; returns the list of (name, ratio) regressions beyond threshold"""
+    print(f"baseline {baseline['git_sha']} vs candidate {candidate['git_sha']} (scale {candidate['scale']})")
+    if baseline['params'] != candidate['params']:
+        print("warning: the two runs used different scale parameters")
+    regressions = []
+    print(f"{'pipeline / stage':<44} {'base s':>9} {'new s':>9} {'change':>8}")
+    for name, new in candidate['pipelines'].items():
+        old = baseline['pipelines'].get(name)
+        if old is None or old['error'] or new['error']:
+            print(f"{name:<44} {'n/a':>9} {'n/a':>9}")
+            continue
+        rows = [(name, old['seconds'], new['seconds'])]
+        for stage, stats in sorted(new['stages'].items()):
+            if stage in old['stages']:
+                rows.append((f"  {stage}", old['stages'][stage]['total_seconds'], stats['total_seconds']))
+        for label, before, after in rows:
+            ratio = after / before - 1 if before else 0.0
+            flag = ' <<' if ratio > threshold else ''
+            print(f"{label:<44} {before:9.3f} {after:9.3f} {ratio:+8.1%}{flag}")
+            if ratio > threshold and not label.startswith(' '):
+                regressions.append((label, ratio))
+    return regressions
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end and per-stage benchmarks for every pipeline on seeded synthetic data")
+    parser.add_argument('--scale', default='small', choices=list(SCALES))
+    parser.add_argument('--only', default=','.join(PIPELINES), help="comma-separated pipelines to run")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeat', type=int, default=1, help="runs per pipeline; the fastest is kept")
+    parser.add_argument('--output-dir', default=RESULTS_DIR)
+    parser.add_argument('--compare', nargs='+', metavar='RESULT_JSON',
+                        help="compare BASELINE [CANDIDATE]; without a candidate the suite runs first")
+    parser.add_argument('--threshold', type=float, default=0.10, help="relative slowdown flagged as a regression")
+    args = parser.parse_args()
+
+    if args.compare and len(args.compare) == 2:
+        regressions = compare(load_results(args.compare[0]), load_results(args.compare[1]), args.threshold)
+        sys.exit(1 if regressions else 0)
+    baseline = load_results(args.compare[0]) if args.compare else None
+    selected = {name.strip() for name in args.only.split(',') if name.strip()}
+    pipelines = [name for name in PIPELINES if name in selected]
+    unknown = selected - set(PIPELINES)
+    if unknown:
+        parser.error(f"unknown pipelines: {', '.join(sorted(unknown))}")
+    result = run_suite(pipelines, baseline['scale'] if baseline else args.scale, args.seed, args.repeat)
+    print(f"Results written to {save_results(result, args.output_dir)}")
+    if baseline:
+        sys.exit(1 if compare(baseline, result, args.threshold) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""Seeded synthetic data for the benchmarks: API payloads behind a local stub server, sales rows and CSVs,
+payroll workbooks, and email / FAQ / free-text corpora. The same seed and scale always produce the same data."""
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIRST_NAMES = ['Ava', 'Liam', 'Noah', 'Mia', 'Zara', 'Arjun', 'Priya', 'Omar', 'Elena', 'Kenji', 'Lucas', 'Sofia']
+LAST_NAMES = ['Patel', 'Smith', 'Garcia', 'Chen', 'Okafor', 'Rossi', 'Kim', 'Novak', 'Silva', 'Dubois']
+CITIES = ['London', 'Paris', 'Berlin', 'Madrid', 'Rome', 'Mumbai', 'Tokyo', 'Toronto', 'Lagos', 'Lima', 'Oslo', 'Seoul']
+COMPANIES = ['Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark', 'Wayne', 'Wonka', 'Tyrell', 'Cyberdyne']
+DOMAINS = ['example.com', 'mail.net', 'corp.io', 'inbox.org', 'post.biz']
+CONDITIONS = ['Clear', 'Cloudy', 'Rainy', 'Sunny', 'Snow', 'Mist']
+LOREM = ("lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore "
+         "et dolore magna aliqua enim ad minim veniam quis nostrud exercitation ullamco laboris").split()
+PRODUCTS = ['Laptop', 'Mobile', 'Keyboard', 'Monitor', 'Mouse', 'Headphones', 'Tablet', 'Printer']
+DEPARTMENTS = ['Engineering', 'Finance', 'HR', 'Marketing', 'Operations', 'Sales', 'Support']
+SPAM_PHRASES = ["you've won", "click here now", "claim your prize", "free offer", "limited time", "act now",
+                "make money from home", "no experience needed", "100% guaranteed", "exclusive deal",
+                "verify your account", "urgent", "winner", "cash bonus", "buy now and save"]
+HAM_PHRASES = ["can we schedule a meeting", "please review the attached document", "the quarterly report is ready",
+               "thanks for your help today", "project deadline moved to friday", "lunch on thursday",
+               "your order has shipped", "notes from the standup", "flight confirmation for tuesday",
+               "see you at the conference", "updated the shared folder", "happy birthday"]
+FAQ_TOPICS = ['password', 'billing', 'refund', 'shipping', 'account', 'invoice', 'delivery', 'subscription',
+              'warranty', 'login', 'order', 'payment', 'return', 'discount', 'support', 'upgrade']
+FAQ_VERBS = ['reset', 'change', 'cancel', 'track', 'update', 'request', 'check', 'renew', 'download', 'contact']
+SUPPORT_WORDS = ("account order refund shipping password reset invoice delivery payment card login email "
+                 "subscription cancel upgrade plan price discount warranty return exchange support hours").split()
+NOISY_WORDS = ("Urgent! FREE offer, click here now. Meeting at 3 PM? Your account #1234 needs verification; "
+               "thanks for the report - see attached. Win $5000 today!!! Project deadline extended").split()
+
+
+def make_users(n, seed=42):
+    """jsonplaceholder-shaped user records"""
+    rng = random.Random(seed)
+    users = []
+    for i in range(1, n + 1):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        users.append({
+            'id': i,
+            'name': f"{first} {last}",
+            'username': f"{first.lower()}{i}",
+            'email': f"{first.lower()}.{last.lower()}{i}@{rng.choice(DOMAINS)}",
+            'address': {
+                'street': f"{rng.randint(1, 999)} {rng.choice(LAST_NAMES)} St",
+                'suite': f"Apt. {rng.randint(1, 999)}",
+                'city': rng.choice(CITIES),
+                'zipcode': f"{rng.randint(10000, 99999)}",
+                'geo': {'lat': f"{rng.uniform(-60, 70):.4f}", 'lng': f"{rng.uniform(-170, 170):.4f}"}
+            },
+            'phone': f"1-{rng.randint(200, 999)}-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}",
+            'website': f"{last.lower()}{i}.org",
+            'company': {'name': f"{rng.choice(COMPANIES)} {rng.choice(['LLC', 'Inc', 'Group'])}",
+                        'catchPhrase': ' '.join(rng.sample(LOREM, 4)), 'bs': ' '.join(rng.sample(LOREM, 3))}
+        })
+    return users
+
+
+def make_posts(n, users=10, seed=42):
+    rng = random.Random(seed)
+    return [{
+        'userId': rng.randint(1, users),
+        'id': i,
+        'title': ' '.join(rng.choices(LOREM, k=rng.randint(3, 10))),
+        'body': '\n'.join(' '.join(rng.choices(LOREM, k=rng.randint(6, 14))) for _ in range(rng.randint(2, 5)))
+    } for i in range(1, n + 1)]
+
+
+def make_todos(n, users=10, seed=42):
+    rng = random.Random(seed)
+    return [{'userId': rng.randint(1, users), 'id': i, 'title': ' '.join(rng.choices(LOREM, k=5)),
+             'completed': rng.random() < 0.5} for i in range(1, n + 1)]
+
+
+def make_crypto_markets(n, seed=42):
+    """coingecko /coins/markets-shaped records, ranked by market cap"""
+    rng = random.Random(seed)
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    caps = sorted((rng.lognormvariate(20, 2.5) for _ in range(n)), reverse=True)
+    coins = []
+    for rank, cap in enumerate(caps, start=1):
+        price = rng.lognormvariate(0, 3)
+        change = rng.gauss(0, 5)
+        coins.append({
+            'id': f"coin-{rank}", 'symbol': f"c{rank}", 'name': f"Coin {rank}",
+            'current_price': round(price, 6), 'market_cap': round(cap), 'market_cap_rank': rank,
+            'total_volume': round(cap * rng.uniform(0.01, 0.3)),
+            'high_24h': round(price * 1.05, 6), 'low_24h': round(price * 0.95, 6),
+            'price_change_24h': round(price * change / 100, 6), 'price_change_percentage_24h': round(change, 4),
+            'circulating_supply': round(cap / price), 'last_updated': (now - timedelta(seconds=rank)).isoformat()
+        })
+    return coins
+
+
+def make_weather(n, seed=42):
+    """OpenWeatherMap-shaped city records, as consumed by Task1.normalize_weather"""
+    rng = random.Random(seed)
+    return [{'name': f"{rng.choice(CITIES)}-{i}",
+             'main': {'temp': round(rng.uniform(-10, 38), 1), 'humidity': rng.randint(20, 95),
+                      'pressure': rng.randint(990, 1035)},
+             'weather': [{'main': rng.choice(CONDITIONS)}]} for i in range(n)]
+
+
+class StubAPIServer:
+    """Local threaded HTTP server serving pre-serialized synthetic payloads for the Task1 endpoints.
+
+    Use as a context manager; `apis` and `crypto_markets_url` plug straight into APIDataVisualizer.
+    latency adds a fixed per-request sleep to mimic network round trips. Weather is not served:
+    Task1 always answers it from its built-in sample cities.
+    """
+    def __init__(self, users=10, posts=100, todos=200, crypto=250, seed=42, latency=0.0):
+        self.payloads = {
+            '/users': json.dumps(make_users(users, seed)).encode(),
+            '/posts': json.dumps(make_posts(posts, users, seed)).encode(),
+            '/todos': json.dumps(make_todos(todos, users, seed)).encode()
+        }
+        self.coins = make_crypto_markets(crypto, seed)
+        self.latency = latency
+        self.requests = 0
+        self.server = None
+        self.thread = None
+
+    def markets_page(self, query):
+        per_page = int(query.get('per_page', ['100'])[0])
+        page = int(query.get('page', ['1'])[0])
+        return json.dumps(self.coins[(page - 1) * per_page:page * per_page]).encode()
+
+    def start(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                stub.requests += 1
+                url = urlparse(self.path)
+                if url.path == '/coins/markets':
+                    body = stub.markets_page(parse_qs(url.query))
+                else:
+                    body = stub.payloads.get(url.path)
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if body is None:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    @property
+    def apis(self):
+        base = self.base_url
+        return {
+            'users': f"{base}/users",
+            'posts': f"{base}/posts",
+            'todos': f"{base}/todos",
+            'crypto': f"{base}/coins/markets?vs_currency=usd&per_page=20&page=1"
+        }
+
+    @property
+    def crypto_markets_url(self):
+        return f"{self.base_url}/coins/markets?vs_currency=usd&order=market_cap_desc"
+
+
+def iter_sales_rows(n, seed=42):
+    """(product, quantity, price) tuples"""
+    rng = random.Random(seed)
+    for _ in range(n):
+        yield rng.choice(PRODUCTS), rng.randint(1, 50), rng.randrange(500, 150000, 50)
+
+
+def make_sales_csv(path, rows, seed=42):
+    with open(path, 'w') as f:
+        f.write('Product,Quantity,Price\n')
+        for product, quantity, price in iter_sales_rows(rows, seed):
+            f.write(f"{product},{quantity},{price}\n")
+    return path
+
+
+def make_sales_dir(directory, files, rows_per_file, seed=42):
+    """One sales CSV per store, as consumed by generate_report.py --batch"""
+    os.makedirs(directory, exist_ok=True)
+    return [make_sales_csv(os.path.join(directory, f"store_{i:05d}.csv"), rows_per_file, seed + i) for i in range(files)]
+
+
+def make_payroll_workbook(path, rows, seed=42):
+    from openpyxl import Workbook
+    rng = random.Random(seed)
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append(['Name', 'Department', 'Salary'])
+    for i in range(rows):
+        sheet.append([f"Employee {i:07d}", rng.choice(DEPARTMENTS), rng.randrange(20000, 200000, 500)])
+    workbook.save(path)
+    return path
+
+
+def make_email_corpus(n, spam_ratio=0.4, noise=0.15, seed=42):
+    """DataFrame of labelled emails; noise mixes phrases from the other class so models are not perfect"""
+    import pandas as pd
+    rng = random.Random(seed)
+    emails, labels = [], []
+    for _ in range(n):
+        label = int(rng.random() < spam_ratio)
+        own, other = (SPAM_PHRASES, HAM_PHRASES) if label else (HAM_PHRASES, SPAM_PHRASES)
+        parts = [rng.choice(own) for _ in range(rng.randint(2, 5))]
+        parts += [rng.choice(other) for _ in range(rng.randint(0, 2)) if rng.random() < noise]
+        parts += rng.choices(LOREM, k=rng.randint(3, 12))
+        rng.shuffle(parts)
+        text = ' '.join(parts)
+        emails.append(text.upper() + '!!!' if label and rng.random() < 0.3 else text.capitalize() + '.')
+        labels.append(label)
+    return pd.DataFrame({'email': emails, 'label': labels})
+
+
+def make_faq_corpus(n, seed=42):
+    """Distinct FAQ-style answers for the chatbot engine"""
+    rng = random.Random(seed)
+    return [f"To {rng.choice(FAQ_VERBS)} your {rng.choice(FAQ_TOPICS)} {rng.choice(FAQ_TOPICS)}, "
+            f"{' '.join(rng.choices(LOREM, k=rng.randint(5, 12)))} (ref {i})." for i in range(n)]
+
+
+def make_queries(n, seed=7):
+    rng = random.Random(seed)
+    return [f"how do I {rng.choice(FAQ_VERBS)} my {rng.choice(FAQ_TOPICS)} {rng.choice(LOREM)}" for _ in range(n)]
+
+
+def make_zipf_corpus(n, vocabulary=20000, seed=42):
+    """Zipf-distributed synthetic questions, so a few terms are common and most are rare"""
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    words = [f"w{i}" for i in range(vocabulary)]
+    lengths = rng.integers(5, 15, size=n)
+    ids = np.minimum(rng.zipf(1.2, size=lengths.sum()) - 1, vocabulary - 1)
+    docs, start = [], 0
+    for length in lengths:
+        docs.append(" ".join(words[i] for i in ids[start:start + length]))
+        start += length
+    return docs
+
+
+def make_paraphrases(corpus, n, seed=7):
+    """Perturb stored questions by dropping a word, like a user paraphrasing a FAQ entry"""
+    rng = random.Random(seed)
+    queries = []
+    for doc in rng.sample(corpus, n):
+        tokens = doc.split()
+        if len(tokens) > 3:
+            tokens.pop(rng.randrange(len(tokens)))
+        queries.append(" ".join(tokens))
+    return queries
+
+
+def make_word_documents(n, words, min_words=4, max_words=12, seed=42):
+    """Documents of min_words..max_words words drawn uniformly from words (e.g. SUPPORT_WORDS, NOISY_WORDS)"""
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(words) for _ in range(rng.randint(min_words, max_words))) for _ in range(n)]
@@ -0,0 +1,103 @@
+import numpy as np
+
+
+class ExactRetriever:
+    """Exact cosine top-1 via one sparse matrix product against every stored response"""
+    def __init__(self, matrix):
+        self.matrix = matrix.tocsr()
+        self.matrixt = self.matrix.T.tocsr()
+
+    def search(self, queryvectors):
+        similarities = queryvectors.tocsr() @ self.matrixt
+        bestidx = np.asarray(similarities.argmax(axis=1)).ravel()
+        bestscores = similarities.max(axis=1).toarray().ravel()
+        return bestidx, bestscores
+
+
+class InvertedIndexRetriever:
+    """Term-at-a-time scoring over impact-ordered posting lists; only documents sharing a query term are touched.
+    maxpostings truncates each list to its highest-weight documents, trading recall for latency."""
+    def __init__(self, matrix, maxpostings=None):
+        coo = matrix.tocoo()
+        order = np.lexsort((-coo.data, coo.col))
+        self.docs = coo.row[order].astype(np.int64)
+        self.weights = coo.data[order]
+        self.indptr = np.searchsorted(coo.col[order], np.arange(matrix.shape[1] + 1))
+        self.maxpostings = maxpostings
+
+    def searchone(self, terms, termweights):
+        docs, scores = [], []
+        for term, termweight in zip(terms, termweights):
+            start, end = self.indptr[term], self.indptr[term + 1]
+            if self.maxpostings is not None:
+                end = min(end, start + self.maxpostings)
+            docs.append(self.docs[start:end])
+            scores.append(self.weights[start:end] * termweight)
+        if not docs or not sum(len(d) for d in docs):
+            return 0, 0.0
+        candidates, inverse = np.unique(np.concatenate(docs), return_inverse=True)
+        totals = np.bincount(inverse, weights=np.concatenate(scores))
+        best = int(np.argmax(totals))
+        return int(candidates[best]), float(totals[best])
+
+    def search(self, queryvectors):
+        queryvectors = queryvectors.tocsr()
+        results = [
+            self.searchone(queryvectors.indices[start:end], queryvectors.data[start:end])
+            for start, end in zip(queryvectors.indptr[:-1], queryvectors.indptr[1:])
+        ]
+        bestidx = np.array([idx for idx, _ in results], dtype=np.int64)
+        bestscores = np.array([score for _, score in results], dtype=np.float64)
+        return bestidx, bestscores
+
+
+class LSHRetriever:
+    """Random-hyperplane LSH: candidates come from matching signature buckets, then get exact rescoring"""
+    def __init__(self, matrix, tables=8, bits=12, seed=42):
+        self.matrix = matrix.tocsr()
+        self.tables = tables
+        self.bits = bits
+        rng = np.random.default_rng(seed)
+        self.planes = rng.standard_normal((matrix.shape[1], tables * bits)).astype(np.float32)
+        self.powers = (1 << np.arange(bits)).astype(np.int64)
+        codes = self.signatures(self.matrix)
+        self.buckets = []
+        for table in range(tables):
+            order = np.argsort(codes[:, table], kind='stable')
+            keys, starts = np.unique(codes[order, table], return_index=True)
+            ends = np.append(starts[1:], len(order))
+            self.buckets.append({key: order[start:end] for key, start, end in zip(keys.tolist(), starts, ends)})
+
+    def signatures(self, vectors):
+        projected = np.asarray(vectors @ self.planes) > 0
+        return (projected.reshape(-1, self.tables, self.bits) * self.powers).sum(axis=2)
+
+    def search(self, queryvectors):
+        queryvectors = queryvectors.tocsr()
+        codes = self.signatures(queryvectors)
+        bestidx = np.zeros(queryvectors.shape[0], dtype=np.int64)
+        bestscores = np.zeros(queryvectors.shape[0], dtype=np.float64)
+        for row in range(queryvectors.shape[0]):
+            hits = [self.buckets[table].get(code) for table, code in enumerate(codes[row].tolist())]
+            hits = [hit for hit in hits if hit is not None]
+            if not hits or queryvectors[row].nnz == 0:
+                continue
+            candidates = np.unique(np.concatenate(hits))
+            similarities = (self.matrix[candidates] @ queryvectors[row].T).toarray().ravel()
+            best = int(np.argmax(similarities))
+            bestidx[row] = candidates[best]
+            bestscores[row] = similarities[best]
+        return bestidx, bestscores
+
+
+retrievers = {
+    'exact': ExactRetriever,
+    'inverted': InvertedIndexRetriever,
+    'lsh': LSHRetriever
+}
+
+
+def makeretriever(backend, matrix, **options):
+    if backend not in retrievers:
+        raise ValueError(f"Unknown retrieval backend '{backend}'. Choose from: {', '.join(retrievers)}")
+    return retrievers[backend](matrix, **options)
@@ -0,0 +1,162 @@
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+import numpy as np
+from Task3 import ChatbotEngine, modelpath, retrievalbackend
+from chatbot_retrieval import retrievers
+from instrumentation import METRICS
+
+STATUS_TEXT = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+               500: 'Internal Server Error'}
+
+
+class ChatbotServer:
+    """Localhost HTTP chat server: many sessions, one shared read-only engine, micro-batched scoring"""
+    def __init__(self, engine, host='127.0.0.1', port=8765, maxbatch=512):
+        self.engine = engine
+        self.host = host
+        self.port = port
+        self.maxbatch = maxbatch
+        self.queue = None
+        self.sessions = {}
+        self.latencies = deque(maxlen=100000)
+        self.handled = 0
+        self.batches = 0
+        self.startedat = time.perf_counter()
+
+    async def ask(self, sessionid, message):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((message, future, time.perf_counter()))
+        self.sessions[sessionid] = self.sessions.get(sessionid, 0) + 1
+        return await future
+
+    async def batcher(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            await asyncio.sleep(0)
+            while len(batch) < self.maxbatch and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            started = time.perf_counter()
+            try:
+                replies = await loop.run_in_executor(None, self.engine.respondbatch, [item[0] for item in batch])
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                METRICS.count('chatbot.batch_errors')
+                continue
+            finished = time.perf_counter()
+            METRICS.observe('chatbot.respondbatch', finished - started)
+            METRICS.count('chatbot.messages', len(batch))
+            for (_, future, queuedat), reply in zip(batch, replies):
+                if not future.done():
+                    future.set_result(reply)
+                self.latencies.append(finished - queuedat)
+            self.handled += len(batch)
+            self.batches += 1
+
+    def stats(self):
+        latencies = np.fromiter(self.latencies, dtype=float) * 1000
+        uptime = time.perf_counter() - self.startedat
+        return {
+            'sessions': len(self.sessions),
+            'handled': self.handled,
+            'batches': self.batches,
+            'meanbatchsize': self.handled / self.batches if self.batches else 0.0,
+            'p50ms': float(np.percentile(latencies, 50)) if len(latencies) else 0.0,
+            'p99ms': float(np.percentile(latencies, 99)) if len(latencies) else 0.0,
+            'throughput': self.handled / uptime if uptime else 0.0
+        }
+
+    async def route(self, method, path, body):
+        if path == '/stats':
+            return 200, self.stats()
+        if path == '/metrics':
+            return 200, METRICS.to_prometheus()
+        if path != '/chat':
+            return 404, {'error': 'not found'}
+        if method != 'POST':
+            return 405, {'error': 'use POST'}
+        try:
+            payload = json.loads(body or b'{}')
+            message = str(payload['message'])
+        except (ValueError, KeyError, TypeError):
+            return 400, {'error': "expected JSON body with a 'message' field"}
+        sessionid = str(payload.get('session', 'anonymous'))
+        return 200, {'session': sessionid, 'response': await self.ask(sessionid, message)}
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                requestline = await reader.readline()
+                if not requestline:
+                    break
+                try:
+                    method, path, _ = requestline.decode('latin-1').split(' ', 2)
+                except ValueError:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get('content-length', 0) or 0)
+                body = await reader.readexactly(length) if length else b''
+                try:
+                    status, payload = await self.route(method.upper(), path.split('?', 1)[0], body)
+                except Exception as e:
+                    METRICS.count('chatbot.request_errors')
+                    status, payload = 500, {'error': f"{type(e).__name__}: {e}"}
+                if isinstance(payload, str):
+                    data, contenttype = payload.encode('utf-8'), 'text/plain; version=0.0.4'
+                else:
+                    data, contenttype = json.dumps(payload).encode('utf-8'), 'application/json'
+                keepalive = headers.get('connection', '').lower() != 'close'
+                writer.write(
+                    f"HTTP/1.1 {status} {STATUS_TEXT[status]}\r\n"
+                    f"Content-Type: {contenttype}\r\nContent-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keepalive else 'close'}\r\n\r\n".encode('latin-1') + data
+                )
+                await writer.drain()
+                if not keepalive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self):
+        self.queue = asyncio.Queue()
+        batcher = asyncio.create_task(self.batcher())
+        server = await asyncio.start_server(self.handle, self.host, self.port, backlog=4096)
+        self.port = server.sockets[0].getsockname()[1]
+        print(f"Chatbot server listening on http://{self.host}:{self.port} (POST /chat, GET /stats, GET /metrics)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the Task3 chatbot over HTTP on localhost")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--model', default=modelpath, help="fitted model artifact (built if missing)")
+    parser.add_argument('--maxbatch', type=int, default=512)
+    parser.add_argument('--backend', default=retrievalbackend, choices=list(retrievers), help="retrieval backend")
+    args = parser.parse_args()
+    engine = ChatbotEngine.loadorfit(args.model, backend=args.backend)
+    try:
+        asyncio.run(ChatbotServer(engine, args.host, args.port, args.maxbatch).serve())
+    except KeyboardInterrupt:
+        print("Chatbot server stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import glob
+import json
+import os
+import pandas as pd
+
+HASH_COLUMN = '_row_hash'
+
+
+def prepare_frame(df):
+    """Serialize nested dict/list cells to JSON so every column has a storable scalar type"""
+    df = df.copy()
+    for column in df.columns[df.dtypes == object]:
+        if df[column].map(lambda v: isinstance(v, (dict, list))).any():
+            df[column] = df[column].map(lambda v: json.dumps(v, sort_keys=True) if isinstance(v, (dict, list)) else v)
+    return df
+
+
+def row_hashes(df):
+    return pd.util.hash_pandas_object(df.drop(columns=[HASH_COLUMN], errors='ignore'), index=False)
+
+
+def with_row_hashes(df):
+    """Attach the content hash of each row, computed from the freshly fetched dtypes"""
+    df = df.copy()
+    df[HASH_COLUMN] = row_hashes(df).values
+    return df
+
+
+def changed_rows(existing, df, key):
+    """Return the rows of df whose key is new or whose content differs from the existing snapshot"""
+    hashes = existing[HASH_COLUMN] if HASH_COLUMN in existing.columns else row_hashes(existing)
+    known = pd.Series(hashes.values, index=existing[key].values)
+    known = known[~known.index.duplicated(keep='last')]
+    previous = known.reindex(df[key].values).values
+    current = df[HASH_COLUMN].values if HASH_COLUMN in df.columns else row_hashes(df).values
+    return df[pd.isna(previous) | (previous != current)]
+
+
+class DataExporter:
+    """Base export backend: full rewrites, or id-keyed upserts when incremental.
+
+    Incremental exports store a _row_hash column computed when the row was written, so
+    later runs compare against that instead of re-hashing data read back from disk,
+    whose dtypes need not match the fresh frame (e.g. CSV zip codes as int64). Full
+    exports keep the plain schema unless store_hashes is set.
+    """
+    extension = ''
+    store_hashes = False
+
+    def __init__(self, output_dir='.', compression=None):
+        self.output_dir = output_dir
+        self.compression = compression
+
+    def path_for(self, name):
+        return os.path.join(self.output_dir, f'{name}_data.{self.extension}')
+
+    def read(self, path, columns=None):
+        raise NotImplementedError
+
+    def write(self, df, path):
+        raise NotImplementedError
+
+    def export(self, name, df, key='id', incremental=False):
+        """Write a dataset snapshot and return (path, number of rows written)"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = self.path_for(name)
+        df = prepare_frame(df)
+        if self.store_hashes or (incremental and key in df.columns):
+            df = with_row_hashes(df)
+        if not incremental or key not in df.columns or not os.path.exists(path):
+            self.write(df, path)
+            return path, len(df)
+        existing = self.read(path)
+        if existing[key].dtype != df[key].dtype:
+            existing[key] = existing[key].astype(df[key].dtype)
+        if HASH_COLUMN not in existing.columns:
+            # written by a full export: hash what was read back, so rows whose dtypes drifted count as changed once
+            existing[HASH_COLUMN] = row_hashes(existing).values
+        delta = changed_rows(existing, df, key)
+        if not delta.empty:
+            merged = pd.concat([existing[~existing[key].isin(delta[key])], delta], ignore_index=True)
+            self.write(merged, path)
+        return path, len(delta)
+
+
+class CSVExporter(DataExporter):
+    extension = 'csv'
+
+    def read(self, path, columns=None):
+        """Read stored rows back as text so rewriting them reproduces the file byte for byte"""
+        header = pd.read_csv(path, nrows=0).columns
+        if HASH_COLUMN not in header:
+            return pd.read_csv(path, usecols=columns, float_precision='round_trip')
+        dtypes = {column: str for column in header}
+        dtypes[HASH_COLUMN] = 'uint64'
+        return pd.read_csv(path, usecols=columns, dtype=dtypes, keep_default_na=False)
+
+    def write(self, df, path):
+        df.to_csv(path, index=False, compression=self.compression)
+
+
+class FeatherExporter(DataExporter):
+    """Arrow IPC snapshots; pass compression=None for files that can be memory-mapped zero-copy"""
+    extension = 'feather'
+
+    def __init__(self, output_dir='.', compression='zstd'):
+        super().__init__(output_dir, compression)
+
+    def read(self, path, columns=None):
+        return pd.read_feather(path, columns=columns)
+
+    def write(self, df, path):
+        df.reset_index(drop=True).to_feather(path, compression=self.compression or 'uncompressed')
+
+
+class ParquetExporter(DataExporter):
+    """Parquet dataset directory; incremental runs append a part file holding only new or changed rows.
+
+    Part files always carry _row_hash (read_snapshot drops it), since any full write may later be appended to.
+    """
+    extension = 'parquet'
+    store_hashes = True
+
+    def __init__(self, output_dir='.', compression='zstd'):
+        super().__init__(output_dir, compression)
+
+    def parts(self, path):
+        return sorted(glob.glob(os.path.join(path, 'part-*.parquet')))
+
+    def read(self, path, columns=None):
+        return pd.read_parquet(self.parts(path), columns=columns)
+
+    def write_part(self, df, path, index):
+        df.to_parquet(os.path.join(path, f'part-{index:05d}.parquet'), index=False, compression=self.compression)
+
+    def write(self, df, path):
+        os.makedirs(path, exist_ok=True)
+        for part in self.parts(path):
+            os.remove(part)
+        self.write_part(df, path, 0)
+
+    def export(self, name, df, key='id', incremental=False):
+        path = self.path_for(name)
+        if not incremental or key not in df.columns or not self.parts(path):
+            return super().export(name, df, key, incremental=False)
+        df = with_row_hashes(prepare_frame(df))
+        existing = self.read(path, columns=[key, HASH_COLUMN])
+        delta = changed_rows(existing, df, key)
+        if not delta.empty:
+            self.write_part(delta, path, len(self.parts(path)))
+        return path, len(delta)
+
+
+def read_snapshot(path, key='id', columns=None):
+    """Load an exported snapshot, keeping the latest version of each key"""
+    if os.path.isdir(path):
+        wanted = None if columns is None else list(dict.fromkeys([key] + list(columns)))
+        df = pd.read_parquet(sorted(glob.glob(os.path.join(path, 'part-*.parquet'))), columns=wanted)
+        df = df.drop_duplicates(subset=key, keep='last').drop(columns=[HASH_COLUMN], errors='ignore')
+        return df.reset_index(drop=True)
+    if path.endswith('.feather'):
+        from pyarrow import feather
+        df = feather.read_table(path, columns=columns, memory_map=True).to_pandas()
+    else:
+        df = pd.read_csv(path, usecols=columns, float_precision='round_trip')
+    return df.drop(columns=[HASH_COLUMN], errors='ignore')
+
+
+EXPORTERS = {
+    'csv': CSVExporter,
+    'parquet': ParquetExporter,
+    'feather': FeatherExporter
+}
+
+
+def get_exporter(export_format='csv', output_dir='.', **kwargs):
+    try:
+        return EXPORTERS[export_format](output_dir=output_dir, **kwargs)
+    except KeyError:
+        raise ValueError(f"Unknown export format '{export_format}'. Choose from: {', '.join(EXPORTERS)}")
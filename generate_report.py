@@ -1,37 +1,142 @@
-from fpdf import FPDF
-import csv
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from instrumentation import count, stage
+from report_engine import ReportPDF, TableRenderer
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
 datafile = 'sales_data.csv'
 reportname = 'Sales Report'
 outputfile = 'salesreport.pdf'
-salesdata = []
-try:
-    with open(datafile, 'r') as file:
-        reader = csv.DictReader(file)
-        for entry in reader:
-            salesdata.append(entry)
-except FileNotFoundError:
-    print(f"Error: File '{datafile}' not found.")
-    exit()
-totalsales = 0
-for item in salesdata:
-    totalsales += int(item['Quantity']) * float(item['Price'])
-report = FPDF()
-report.add_page()
-report.set_font("Helvetica", 'B', 16)
-report.cell(200, 10, text=reportname, new_x="LMARGIN", new_y="NEXT", align='C')
-report.ln(10)
-report.set_font("Helvetica", 'B', 12)
-for column in salesdata[0].keys():
-    report.cell(40, 10, text=column.title(), border=1, align='C')
-report.ln()
-report.set_font("Helvetica", size=10)
-for row in salesdata:
-    for value in row.values():
-        report.cell(40, 10, text=str(value), border=1, align='C')
-    report.ln()
-if totalsales > 0:
-    report.ln(10)
-    report.set_font("Helvetica", 'B', 12)
-    report.cell(0, 10, text=f"Total Sales: {totalsales:₹.2f}", new_x="LMARGIN", new_y="NEXT", align='R')
-report.output(outputfile)
-print(f"Report '{outputfile}' generated successfully.")
+SALES_DTYPES = {'Quantity': 'int64', 'Price': 'float64'}
+MONEY_COLUMNS = ('Price', 'Line Total')
+def load_sales(path):
+    """Parse the CSV once into typed columns and add vectorized line totals"""
+    sales = pd.read_csv(path, dtype=SALES_DTYPES, engine='pyarrow' if HAS_PYARROW else 'c')
+    if sales.empty:
+        raise ValueError(f"'{path}' has no data rows")
+    sales['Line Total'] = sales['Quantity'] * sales['Price']
+    return sales
+def format_column(values, template='{}'):
+    """Format each distinct value once and broadcast the strings back with the factorized codes"""
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    formatted = np.array([template.format(value) for value in uniques.tolist()], dtype=object)
+    return formatted[codes].tolist()
+def format_columns(sales):
+    """Pre-format each column once so the renderer only copies strings"""
+    return [format_column(sales[column], '{:,.2f}' if column in MONEY_COLUMNS else '{}') for column in sales.columns]
+def render_sales_report(datafile=datafile, outputfile=outputfile, reportname=reportname):
+    """Render one sales CSV to a PDF path or binary file object and return (rows, total sales)"""
+    with stage('sales.load'):
+        sales = load_sales(datafile)
+        totalsales = float(sales['Line Total'].sum())
+    with stage('sales.format'):
+        buffers = format_columns(sales)
+    report = ReportPDF()
+    with stage('sales.render'):
+        report.title_block(reportname)
+        report.ln(5)
+        table = TableRenderer([column.title() for column in sales.columns])
+        table.render(report, zip(*buffers))
+        if totalsales > 0:
+            report.ln(10)
+            report.text_line(f"Total Sales: Rs {totalsales:,.2f}", bold=True, align='R')
+    with stage('sales.output'):
+        report.write_to(outputfile)
+    count('sales.rows', len(sales))
+    return len(sales), totalsales
+def render_job(job):
+    """Process-pool worker: never raises, so one bad input cannot abort the batch"""
+    source, target = job
+    start = time.perf_counter()
+    record = {'input': source, 'output': target}
+    try:
+        stem = os.path.splitext(os.path.basename(source))[0]
+        rows, total = render_sales_report(source, target, f"{reportname} - {stem}")
+        record.update(status='ok', rows=rows, total_sales=total)
+    except Exception as e:
+        record.update(status='failed', error=f"{type(e).__name__}: {e}")
+    record['seconds'] = round(time.perf_counter() - start, 4)
+    return record
+def resolve_inputs(source):
+    """A directory means every *.csv inside it; anything else is treated as a glob pattern"""
+    pattern = os.path.join(source, '*.csv') if os.path.isdir(source) else source
+    return sorted(glob.glob(pattern))
+def output_paths(inputs, output_dir):
+    """Mirror each input's path below the inputs' common directory, so stores/*/sales.csv cannot collide"""
+    if not inputs:
+        return []
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in inputs])
+    return [os.path.join(output_dir, os.path.splitext(os.path.relpath(os.path.abspath(path), root))[0] + '.pdf')
+            for path in inputs]
+def batch_render(source, output_dir='reports', max_workers=None, manifest_path=None):
+    """Render every CSV matched by source into output_dir in a process pool and write a JSON manifest"""
+    inputs = resolve_inputs(source)
+    jobs = list(zip(inputs, output_paths(inputs, output_dir)))
+    os.makedirs(output_dir, exist_ok=True)
+    for directory in {os.path.dirname(target) for _, target in jobs}:
+        os.makedirs(directory, exist_ok=True)
+    start = time.perf_counter()
+    records = []
+    if jobs:
+        workers = max_workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(render_job, job) for job in jobs]
+            for (source_path, target), future in zip(jobs, futures):
+                # render_job never raises, so an exception here means the worker itself died
+                try:
+                    records.append(future.result())
+                except Exception as e:
+                    records.append({'input': source_path, 'output': target, 'status': 'failed',
+                                    'error': f"{type(e).__name__}: {e}", 'seconds': None})
+    failed = [record for record in records if record['status'] != 'ok']
+    manifest = {
+        'source': source,
+        'output_dir': output_dir,
+        'reports': len(records),
+        'succeeded': len(records) - len(failed),
+        'failed': len(failed),
+        'wall_seconds': round(time.perf_counter() - start, 4),
+        'files': records
+    }
+    manifest_path = manifest_path or os.path.join(output_dir, 'manifest.json')
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Render sales CSVs to PDF reports")
+    parser.add_argument('--input', default=datafile)
+    parser.add_argument('--output', default=outputfile)
+    parser.add_argument('--batch', metavar='DIR_OR_GLOB', help="render every CSV in a directory or matching a glob")
+    parser.add_argument('--output-dir', default='reports', help="where batch PDFs and the manifest are written")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--manifest', default=None, help="manifest path (default: <output-dir>/manifest.json)")
+    return parser.parse_args(argv)
+def main(argv=None):
+    args = parse_args(argv)
+    if args.batch:
+        manifest = batch_render(args.batch, args.output_dir, args.workers, args.manifest)
+        print(f"Rendered {manifest['succeeded']}/{manifest['reports']} reports in {manifest['wall_seconds']:.2f}s "
+              f"({manifest['failed']} failed)")
+        return 1 if manifest['failed'] else 0
+    start = time.perf_counter()
+    try:
+        rows, _ = render_sales_report(args.input, args.output)
+    except FileNotFoundError:
+        print(f"Error: File '{args.input}' not found.")
+        return 1
+    elapsed = time.perf_counter() - start
+    print(f"Report '{args.output}' generated successfully.")
+    print(f"{rows} rows in {elapsed:.2f}s ({rows / elapsed if elapsed else 0:,.0f} rows/s)")
+    return 0
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+import atexit
+import functools
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+PROFILE_ENV = 'PERF_PROFILE'
+PROFILE_FILE_ENV = 'PERF_PROFILE_FILE'
+METRICS_FILE_ENV = 'PERF_METRICS_FILE'
+
+
+class Metrics:
+    """Thread-safe per-stage latency/memory statistics and counters for one process.
+
+    Stage names are dotted paths such as 'fetch.users' or 'report.render'. Memory figures
+    are only collected while tracemalloc is tracing (PERF_PROFILE=tracemalloc): alloc_bytes
+    is the net traced allocation across the stage, peak_bytes the traced peak seen at exit.
+    tracemalloc is looked up in sys.modules rather than imported, so importing this module
+    stays cheap for the chatbot's cold start.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stages = {}
+        self.counters = {}
+
+    def reset(self):
+        with self.lock:
+            self.stages.clear()
+            self.counters.clear()
+
+    def observe(self, name, seconds, alloc_bytes=None, peak_bytes=None):
+        with self.lock:
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = {'count': 0, 'total_seconds': 0.0, 'max_seconds': 0.0}
+            stats['count'] += 1
+            stats['total_seconds'] += seconds
+            stats['last_seconds'] = seconds
+            if seconds > stats['max_seconds']:
+                stats['max_seconds'] = seconds
+            if alloc_bytes is not None:
+                stats['alloc_bytes'] = max(stats.get('alloc_bytes', alloc_bytes), alloc_bytes)
+                stats['peak_bytes'] = max(stats.get('peak_bytes', peak_bytes), peak_bytes)
+
+    def count(self, name, value=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    @contextmanager
+    def stage(self, name):
+        tracemalloc = sys.modules.get('tracemalloc')
+        tracing = tracemalloc is not None and tracemalloc.is_tracing()
+        before = tracemalloc.get_traced_memory()[0] if tracing else None
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            if tracing and tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                self.observe(name, seconds, current - before, peak)
+            else:
+                self.observe(name, seconds)
+
+    def timed(self, name=None):
+        """Decorator form of stage(); defaults to the function's qualified name"""
+        def decorator(func):
+            label = name or func.__qualname__
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(label):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        with self.lock:
+            stages = {name: dict(stats) for name, stats in self.stages.items()}
+            counters = dict(self.counters)
+        for stats in stages.values():
+            stats['mean_seconds'] = stats['total_seconds'] / stats['count']
+        return {'pid': os.getpid(), 'time': time.time(), 'max_rss_bytes': max_rss_bytes(),
+                'stages': stages, 'counters': counters}
+
+    def to_json(self):
+        import json
+        return json.dumps(self.snapshot(), indent=2, sort_keys=True)
+
+    def to_prometheus(self, prefix='app'):
+        """Render the snapshot in the Prometheus text exposition format"""
+        snap = self.snapshot()
+        lines = [f'# TYPE {prefix}_stage_seconds summary']
+        for name, stats in sorted(snap['stages'].items()):
+            lines.append(f'{prefix}_stage_seconds_count{{stage="{name}"}} {stats["count"]}')
+            lines.append(f'{prefix}_stage_seconds_sum{{stage="{name}"}} {stats["total_seconds"]:.6f}')
+        lines.append(f'# TYPE {prefix}_stage_seconds_max gauge')
+        for name, stats in sorted(snap['stages'].items()):
+            lines.append(f'{prefix}_stage_seconds_max{{stage="{name}"}} {stats["max_seconds"]:.6f}')
+        memory = [(name, stats) for name, stats in sorted(snap['stages'].items()) if 'peak_bytes' in stats]
+        if memory:
+            lines.append(f'# TYPE {prefix}_stage_alloc_bytes gauge')
+            lines.extend(f'{prefix}_stage_alloc_bytes{{stage="{name}"}} {stats["alloc_bytes"]}' for name, stats in memory)
+            lines.append(f'# TYPE {prefix}_stage_peak_bytes gauge')
+            lines.extend(f'{prefix}_stage_peak_bytes{{stage="{name}"}} {stats["peak_bytes"]}' for name, stats in memory)
+        for name, value in sorted(snap['counters'].items()):
+            metric = f'{prefix}_{re.sub(r"[^a-zA-Z0-9_]", "_", name)}_total'
+            lines.append(f'# TYPE {metric} counter')
+            lines.append(f'{metric} {value}')
+        if snap['max_rss_bytes'] is not None:
+            lines.append(f'# TYPE {prefix}_max_rss_bytes gauge')
+            lines.append(f'{prefix}_max_rss_bytes {snap["max_rss_bytes"]}')
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, path):
+        """Write metrics to path: Prometheus text for .prom/.txt files, JSON otherwise"""
+        text = self.to_prometheus() if path.endswith(('.prom', '.txt')) else self.to_json()
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def report(self):
+        """Human-readable per-stage table, slowest total first"""
+        snap = self.snapshot()
+        lines = [f"{'stage':<32} {'count':>7} {'total s':>9} {'mean ms':>9} {'max ms':>9} {'peak MB':>8}"]
+        for name, stats in sorted(snap['stages'].items(), key=lambda item: -item[1]['total_seconds']):
+            peak = f"{stats['peak_bytes'] / 1e6:8.1f}" if 'peak_bytes' in stats else f"{'-':>8}"
+            lines.append(f"{name:<32} {stats['count']:>7} {stats['total_seconds']:9.3f} "
+                         f"{stats['mean_seconds'] * 1000:9.2f} {stats['max_seconds'] * 1000:9.2f} {peak}")
+        for name, value in sorted(snap['counters'].items()):
+            lines.append(f"{name:<32} {value:>7}")
+        return '\n'.join(lines)
+
+
+def max_rss_bytes():
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+METRICS = Metrics()
+stage = METRICS.stage
+timed = METRICS.timed
+observe = METRICS.observe
+count = METRICS.count
+
+PROFILER = None
+
+
+def start_profiling(modes):
+    """Enable cProfile and/or tracemalloc for the rest of the process"""
+    global PROFILER
+    if 'tracemalloc' in modes:
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+    if 'cprofile' in modes and PROFILER is None:
+        import cProfile
+        PROFILER = cProfile.Profile()
+        PROFILER.enable()
+
+
+def finish_profiling(path=None, top=20):
+    """Stop the profilers, save cProfile stats to path and print the top functions and allocation sites"""
+    global PROFILER
+    if PROFILER is not None:
+        import pstats
+        PROFILER.disable()
+        path = path or os.environ.get(PROFILE_FILE_ENV, 'profile.pstats')
+        PROFILER.dump_stats(path)
+        print(f"cProfile stats written to {path}")
+        pstats.Stats(path).sort_stats('cumulative').print_stats(top)
+        PROFILER = None
+    tracemalloc = sys.modules.get('tracemalloc')
+    if tracemalloc is not None and tracemalloc.is_tracing():
+        print("Top allocation sites (tracemalloc):")
+        for stat in tracemalloc.take_snapshot().statistics('lineno')[:top // 2]:
+            print(f"  {stat}")
+        tracemalloc.stop()
+
+
+def at_exit():
+    path = os.environ.get(METRICS_FILE_ENV)
+    if path and METRICS.stages:
+        METRICS.dump(path)
+    if os.environ.get(PROFILE_ENV):
+        finish_profiling()
+
+
+if os.environ.get(PROFILE_ENV):
+    start_profiling({mode.strip().lower() for mode in os.environ[PROFILE_ENV].split(',')})
+if os.environ.get(PROFILE_ENV) or os.environ.get(METRICS_FILE_ENV):
+    atexit.register(at_exit)
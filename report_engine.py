@@ -0,0 +1,142 @@
+from itertools import chain, islice
+
+from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+
+CHAR_WIDTHS = {}
+
+
+def string_width(pdf, text):
+    """Width of text in the current font, summed from a per-character cache shared by every document"""
+    key = (pdf.font_family, pdf.font_style, pdf.font_size_pt)
+    widths = CHAR_WIDTHS.get(key)
+    if widths is None:
+        widths = CHAR_WIDTHS[key] = {}
+    total = 0
+    for char in text:
+        width = widths.get(char)
+        if width is None:
+            width = widths[char] = pdf.get_string_width(char)
+        total += width
+    return total
+
+
+def iter_rows(data):
+    """Rows as tuples from a DataFrame, or the iterable itself"""
+    if hasattr(data, 'itertuples'):
+        return data.itertuples(index=False, name=None)
+    return iter(data)
+
+
+class ReportPDF(FPDF):
+    """FPDF document that redraws the active table's header at the top of every new page"""
+    def __init__(self, orientation='P'):
+        super().__init__(orientation=orientation)
+        self.active_table = None
+
+    def header(self):
+        if self.active_table is not None:
+            self.active_table.draw_header(self)
+
+    def title_block(self, title, size=16):
+        self.add_page()
+        self.set_font("Helvetica", "B", size)
+        self.cell(0, 10, text=title, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
+        self.ln(5)
+
+    def text_line(self, text, bold=False, size=12, align='L'):
+        self.set_font("Helvetica", "B" if bold else "", size)
+        self.cell(0, 10, text=text, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align=align)
+
+    def write_to(self, target=None):
+        """Write to a path or a binary file-like object; with no target, return the PDF bytes"""
+        if target is None:
+            return bytes(self.output())
+        if hasattr(target, 'write'):
+            target.write(self.output())
+            return target
+        self.output(target)
+        return target
+
+
+class TableRenderer:
+    """Bordered table whose column widths are fitted once from a sample of rows.
+
+    formats maps a column name to a str.format template (e.g. 'Rs {}'); other values go
+    through str(). Rows never split across pages: a row that would cross the page break
+    trigger starts a new page, and the header is repeated there unless show_header is False.
+    """
+    def __init__(self, columns, formats=None, widths=None, size=10, header_size=12, line_height=10,
+                 align='C', bold=False, show_header=True, sample_size=200, padding=2):
+        self.columns = list(columns)
+        self.formats = [formats.get(column) if formats else None for column in self.columns]
+        self.widths = list(widths) if widths else None
+        self.size = size
+        self.header_size = header_size
+        self.line_height = line_height
+        self.align = align
+        self.style = "B" if bold else ""
+        self.show_header = show_header
+        self.sample_size = sample_size
+        self.padding = padding
+
+    def format_row(self, row):
+        return [template.format(value) if template else str(value) for template, value in zip(self.formats, row)]
+
+    def fit(self, pdf, sample):
+        """Set column widths in proportion to the widest sampled string, scaled to the page width"""
+        natural = [0.0] * len(self.columns)
+        if self.show_header:
+            pdf.set_font("Helvetica", "B", self.header_size)
+            natural = [string_width(pdf, column) for column in self.columns]
+        pdf.set_font("Helvetica", self.style, self.size)
+        for row in sample:
+            for i, text in enumerate(self.format_row(row)):
+                width = string_width(pdf, text)
+                if width > natural[i]:
+                    natural[i] = width
+        natural = [width + 2 * self.padding for width in natural]
+        scale = pdf.epw / sum(natural)
+        self.widths = [width * scale for width in natural]
+        return self.widths
+
+    def fit_sample(self, pdf, data):
+        """Fit widths from evenly spaced DataFrame rows or the head of an iterator; returns the rows still to draw"""
+        rows = iter_rows(data)
+        if hasattr(data, 'iloc') and len(data) > self.sample_size:
+            sample = list(iter_rows(data.iloc[::len(data) // self.sample_size]))
+        else:
+            sample = list(islice(rows, self.sample_size))
+            rows = chain(sample, rows)
+        self.fit(pdf, sample)
+        return rows
+
+    def draw_header(self, pdf):
+        pdf.set_font("Helvetica", "B", self.header_size)
+        for column, width in zip(self.columns, self.widths):
+            pdf.cell(width, self.line_height, column, border=1, align='C')
+        pdf.ln(self.line_height)
+        pdf.set_font("Helvetica", self.style, self.size)
+
+    def render(self, pdf, data):
+        """Draw every row of a DataFrame or row iterator; returns the number of rows drawn"""
+        rows = self.fit_sample(pdf, data) if self.widths is None else iter_rows(data)
+        if self.show_header:
+            if pdf.y + 2 * self.line_height > pdf.page_break_trigger:
+                pdf.add_page()
+            self.draw_header(pdf)
+            pdf.active_table = self
+        pdf.set_font("Helvetica", self.style, self.size)
+        height = self.line_height
+        widths = self.widths
+        align = self.align
+        count = 0
+        for row in rows:
+            if pdf.y + height > pdf.page_break_trigger:
+                pdf.add_page()
+            for width, text in zip(widths, self.format_row(row)):
+                pdf.cell(width, height, text, border=1, align=align)
+            pdf.ln(height)
+            count += 1
+        pdf.active_table = None
+        return count
@@ -0,0 +1,175 @@
+import hashlib
+import sqlite3
+import threading
+import time
+import pandas as pd
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS crypto_snapshots (
+    ts REAL NOT NULL,
+    coin_id TEXT NOT NULL,
+    price REAL,
+    market_cap REAL,
+    volume REAL,
+    change_24h REAL
+);
+CREATE INDEX IF NOT EXISTS idx_crypto_coin_ts ON crypto_snapshots (coin_id, ts);
+CREATE INDEX IF NOT EXISTS idx_crypto_ts ON crypto_snapshots (ts);
+CREATE TABLE IF NOT EXISTS weather_snapshots (
+    ts REAL NOT NULL,
+    city TEXT NOT NULL,
+    temperature REAL,
+    humidity REAL,
+    pressure REAL
+);
+CREATE INDEX IF NOT EXISTS idx_weather_city_ts ON weather_snapshots (city, ts);
+CREATE INDEX IF NOT EXISTS idx_weather_ts ON weather_snapshots (ts);
+CREATE TABLE IF NOT EXISTS crypto_aggregates (
+    coin_id TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    min_price REAL,
+    max_price REAL,
+    mean_price REAL,
+    ema_price REAL,
+    last_price REAL,
+    last_change_24h REAL,
+    first_ts REAL,
+    last_ts REAL
+);
+CREATE TABLE IF NOT EXISTS weather_aggregates (
+    city TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    min_temp REAL,
+    max_temp REAL,
+    mean_temp REAL,
+    ema_temp REAL,
+    last_temp REAL,
+    first_ts REAL,
+    last_ts REAL
+);
+CREATE TABLE IF NOT EXISTS snapshot_meta (
+    kind TEXT PRIMARY KEY,
+    last_hash TEXT,
+    last_ts REAL
+);
+"""
+
+CRYPTO_AGGREGATE_UPSERT = """
+INSERT INTO crypto_aggregates
+    (coin_id, count, min_price, max_price, mean_price, ema_price, last_price, last_change_24h, first_ts, last_ts)
+VALUES (?, 1, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (coin_id) DO UPDATE SET
+    count = count + 1,
+    min_price = MIN(min_price, excluded.min_price),
+    max_price = MAX(max_price, excluded.max_price),
+    mean_price = mean_price + (excluded.mean_price - mean_price) / (count + 1),
+    ema_price = ema_price + {alpha} * (excluded.ema_price - ema_price),
+    last_price = excluded.last_price,
+    last_change_24h = excluded.last_change_24h,
+    last_ts = excluded.last_ts
+"""
+
+WEATHER_AGGREGATE_UPSERT = """
+INSERT INTO weather_aggregates
+    (city, count, min_temp, max_temp, mean_temp, ema_temp, last_temp, first_ts, last_ts)
+VALUES (?, 1, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (city) DO UPDATE SET
+    count = count + 1,
+    min_temp = MIN(min_temp, excluded.min_temp),
+    max_temp = MAX(max_temp, excluded.max_temp),
+    mean_temp = mean_temp + (excluded.mean_temp - mean_temp) / (count + 1),
+    ema_temp = ema_temp + {alpha} * (excluded.ema_temp - ema_temp),
+    last_temp = excluded.last_temp,
+    last_ts = excluded.last_ts
+"""
+
+QUERIES = {
+    'crypto': ('crypto_snapshots', 'coin_id'),
+    'weather': ('weather_snapshots', 'city')
+}
+
+
+class SnapshotStore:
+    """SQLite time-series store for crypto and weather snapshots with incrementally maintained aggregates"""
+    def __init__(self, path='snapshots.db', ema_alpha=0.2):
+        self.path = path
+        self.ema_alpha = float(ema_alpha)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def is_duplicate(self, kind, frame):
+        """True when frame matches the last recorded payload, e.g. a response served from cache"""
+        digest = hashlib.sha256(pd.util.hash_pandas_object(frame, index=False).values.tobytes()).hexdigest()
+        row = self.conn.execute('SELECT last_hash FROM snapshot_meta WHERE kind = ?', (kind,)).fetchone()
+        return digest, row is not None and row[0] == digest
+
+    def record_crypto(self, crypto_df, ts=None):
+        """Append one crypto snapshot and fold it into the running aggregates; returns rows written"""
+        ts = time.time() if ts is None else ts
+        frame = crypto_df[['id', 'current_price', 'market_cap', 'total_volume', 'price_change_percentage_24h']]
+        frame = frame.dropna(subset=['id', 'current_price'])
+        with self.lock:
+            digest, duplicate = self.is_duplicate('crypto', frame)
+            if duplicate:
+                return 0
+            rows = [(ts, coin, price, cap, volume, change) for coin, price, cap, volume, change in frame.itertuples(index=False)]
+            with self.conn:
+                self.conn.executemany('INSERT INTO crypto_snapshots VALUES (?, ?, ?, ?, ?, ?)', rows)
+                self.conn.executemany(
+                    CRYPTO_AGGREGATE_UPSERT.format(alpha=self.ema_alpha),
+                    [(coin, price, price, price, price, price, change, ts, ts) for ts, coin, price, cap, volume, change in rows]
+                )
+                self.conn.execute('INSERT OR REPLACE INTO snapshot_meta VALUES (?, ?, ?)', ('crypto', digest, ts))
+        return len(rows)
+
+    def record_weather(self, weather_df, ts=None):
+        """Append one weather snapshot and fold it into the running aggregates; returns rows written"""
+        ts = time.time() if ts is None else ts
+        frame = weather_df[['name', 'temperature', 'humidity', 'pressure']].dropna(subset=['name', 'temperature'])
+        with self.lock:
+            digest, duplicate = self.is_duplicate('weather', frame)
+            if duplicate:
+                return 0
+            rows = [(ts, city, temp, humidity, pressure) for city, temp, humidity, pressure in frame.itertuples(index=False)]
+            with self.conn:
+                self.conn.executemany('INSERT INTO weather_snapshots VALUES (?, ?, ?, ?, ?)', rows)
+                self.conn.executemany(
+                    WEATHER_AGGREGATE_UPSERT.format(alpha=self.ema_alpha),
+                    [(city, temp, temp, temp, temp, temp, ts, ts) for ts, city, temp, humidity, pressure in rows]
+                )
+                self.conn.execute('INSERT OR REPLACE INTO snapshot_meta VALUES (?, ?, ?)', ('weather', digest, ts))
+        return len(rows)
+
+    def query(self, kind, start=None, end=None, key=None):
+        """Return snapshots of one kind in [start, end], optionally for a single coin or city"""
+        table, key_column = QUERIES[kind]
+        clauses, params = [], []
+        if key is not None:
+            clauses.append(f'{key_column} = ?')
+            params.append(key)
+        if start is not None:
+            clauses.append('ts >= ?')
+            params.append(start)
+        if end is not None:
+            clauses.append('ts <= ?')
+            params.append(end)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        with self.lock:
+            return pd.read_sql_query(f'SELECT * FROM {table}{where} ORDER BY ts', self.conn, params=params)
+
+    def window_summary(self, kind, start=None):
+        """(rows, first ts, last ts) of one kind at or after start; changes whenever query() over that window would"""
+        table, _ = QUERIES[kind]
+        with self.lock:
+            return self.conn.execute(f'SELECT COUNT(*), MIN(ts), MAX(ts) FROM {table} WHERE ts >= ?', (start or 0,)).fetchone()
+
+    def aggregates(self, kind):
+        """Return the running aggregates for every coin or city"""
+        with self.lock:
+            return pd.read_sql_query(f'SELECT * FROM {kind}_aggregates', self.conn)
@@ -0,0 +1,108 @@
+import re
+import string
+
+
+class TextNormalizer:
+    """Configurable text normalization shared by the chatbot and the spam detector.
+
+    Steps run in a fixed order: case folding, character stripping, then optional
+    stemming or lemmatization of whitespace-separated tokens. Token lookups are
+    memoized per normalizer, so repeated words cost one dictionary hit.
+    """
+    def __init__(self, lowercase=True, strip_punctuation=True, strip_digits=False, ascii_letters_only=False,
+                 stem=False, lemmatize=False):
+        if stem and lemmatize:
+            raise ValueError("Choose either stem or lemmatize, not both")
+        self.lowercase = lowercase
+        self.strip_punctuation = strip_punctuation
+        self.strip_digits = strip_digits
+        self.ascii_letters_only = ascii_letters_only
+        self.stem = stem
+        self.lemmatize = lemmatize
+        deleted = (string.punctuation if strip_punctuation else '') + (string.digits if strip_digits else '')
+        self.table = str.maketrans('', '', deleted) if deleted else None
+        self.pattern = re.compile(r'[^a-zA-Z\s]') if ascii_letters_only else None
+        self.token_cache = {}
+        self.token_mapper = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['token_cache'] = {}
+        state['token_mapper'] = None
+        return state
+
+    def config(self):
+        """The settings that decide the output, e.g. for keying artifacts built from normalized text"""
+        return {'lowercase': self.lowercase, 'strip_punctuation': self.strip_punctuation,
+                'strip_digits': self.strip_digits, 'ascii_letters_only': self.ascii_letters_only,
+                'stem': self.stem, 'lemmatize': self.lemmatize}
+
+    def get_token_mapper(self):
+        if self.token_mapper is None:
+            if self.stem:
+                from nltk.stem import PorterStemmer
+                self.token_mapper = PorterStemmer().stem
+            else:
+                import nltk
+                try:
+                    nltk.data.find('corpora/wordnet')
+                except LookupError:
+                    nltk.download('wordnet', quiet=True)
+                    nltk.download('omw-1.4', quiet=True)
+                from nltk.stem import WordNetLemmatizer
+                self.token_mapper = WordNetLemmatizer().lemmatize
+        return self.token_mapper
+
+    def map_tokens(self, text):
+        cache = self.token_cache
+        mapper = self.get_token_mapper()
+        tokens = []
+        for token in text.split():
+            mapped = cache.get(token)
+            if mapped is None:
+                mapped = cache[token] = mapper(token)
+            tokens.append(mapped)
+        return ' '.join(tokens)
+
+    def normalize(self, text):
+        if self.lowercase:
+            text = text.lower()
+        if self.table is not None:
+            text = text.translate(self.table)
+        if self.pattern is not None:
+            text = self.pattern.sub('', text)
+        if self.stem or self.lemmatize:
+            text = self.map_tokens(text)
+        return text
+
+    def normalize_series(self, texts):
+        """Vectorized normalization of a pandas Series of strings"""
+        if self.lowercase:
+            texts = texts.str.lower()
+        if self.table is not None:
+            texts = texts.str.translate(self.table)
+        if self.pattern is not None:
+            texts = texts.str.replace(self.pattern, '', regex=True)
+        if self.stem or self.lemmatize:
+            texts = texts.map(self.map_tokens)
+        return texts
+
+    def normalize_chunk(self, texts):
+        return [self.normalize(text) for text in texts]
+
+    def normalize_many(self, texts, n_jobs=None, chunksize=50000):
+        """Normalize a large list of documents, split into chunks across a process pool"""
+        texts = list(texts)
+        if n_jobs == 1 or len(texts) <= chunksize:
+            return self.normalize_chunk(texts)
+        from concurrent.futures import ProcessPoolExecutor
+        chunks = [texts[start:start + chunksize] for start in range(0, len(texts), chunksize)]
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            results = []
+            for normalized in executor.map(self.normalize_chunk, chunks):
+                results.extend(normalized)
+        return results
+
+
+CHATBOT_NORMALIZER = TextNormalizer(strip_punctuation=True)
+SPAM_NORMALIZER = TextNormalizer(strip_punctuation=False, ascii_letters_only=True)